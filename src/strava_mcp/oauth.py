@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import secrets
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import Any
 
 import requests
-from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -16,14 +19,17 @@ from fastapi.templating import Jinja2Templates
 from stravalib import Client
 
 from .tokens import (
+    TokenDict,
     get_client_id,
     get_client_secret,
+    get_http_session,
     has_credentials,
+    load_env,
     save_tokens,
     token_response_to_dict,
 )
 
-load_dotenv(override=True)
+load_env()
 
 # Get the directory where this file is located (for absolute paths)
 PACKAGE_DIR = Path(__file__).parent
@@ -53,18 +59,25 @@ async def add_security_headers(request: Request, call_next):
 # CSRF Protection - In-Memory State Storage
 # =============================================================================
 
-# Thread-safe state storage for CSRF protection
-_pending_states: dict[str, float] = {}  # state -> timestamp
+# Thread-safe state storage for CSRF protection. States are inserted in
+# creation order, so the oldest entries are always at the front.
+_pending_states: OrderedDict[str, float] = OrderedDict()  # state -> timestamp
 _state_lock = threading.Lock()
 STATE_TTL_SECONDS = 600  # 10 minutes
 
 
 def _cleanup_expired_states() -> None:
-    """Remove expired states from storage."""
+    """Remove expired states from the front of storage.
+
+    Stops at the first unexpired state, so the cost is proportional to the
+    number of expired entries rather than the size of the store.
+    """
     cutoff = time.time() - STATE_TTL_SECONDS
-    expired = [k for k, v in _pending_states.items() if v < cutoff]
-    for k in expired:
-        del _pending_states[k]
+    while _pending_states:
+        created_at = next(iter(_pending_states.values()))
+        if created_at >= cutoff:
+            break
+        _pending_states.popitem(last=False)
 
 
 def generate_oauth_state() -> str:
@@ -85,16 +98,18 @@ def validate_oauth_state(state: str | None) -> bool:
     if not state:
         return False
     with _state_lock:
-        _cleanup_expired_states()
-        if state not in _pending_states:
-            return False
-        # Check if expired (should already be cleaned, but double-check)
-        if time.time() - _pending_states[state] > STATE_TTL_SECONDS:
-            del _pending_states[state]
-            return False
-        # Valid - consume the state (single-use)
-        del _pending_states[state]
-        return True
+        # Consume the state (single-use). Expired entries are swept when new
+        # states are generated, so only this entry's age matters here.
+        created_at = _pending_states.pop(state, None)
+    if created_at is None:
+        return False
+    return time.time() - created_at <= STATE_TTL_SECONDS
+
+
+@functools.cache
+def _get_unauthenticated_client() -> Client:
+    """Return a shared client for stateless calls like authorization_url."""
+    return Client()
 
 
 # Mount static files using absolute path
@@ -103,10 +118,20 @@ app.mount("/static", StaticFiles(directory=PACKAGE_DIR / "static"), name="static
 # Setup templates using absolute path
 templates = Jinja2Templates(directory=PACKAGE_DIR / "templates")
 
+# Templates ship with the package and never change at runtime: skip the
+# per-render mtime check and compile them once up front.
+templates.env.auto_reload = False
+for _template_name in templates.env.list_templates():
+    templates.env.get_template(_template_name)
+
 
 @app.get("/", response_class=HTMLResponse)
-def login(request: Request) -> HTMLResponse:
-    """Render the login page with Strava authorization link."""
+async def login(request: Request) -> HTMLResponse:
+    """Render the login page with Strava authorization link.
+
+    Runs directly on the event loop: building the authorization URL is pure
+    string formatting, so there is nothing to hand off to the threadpool.
+    """
     # Check if Strava credentials are configured
     if not has_credentials():
         return templates.TemplateResponse(
@@ -124,9 +149,8 @@ def login(request: Request) -> HTMLResponse:
     # Generate CSRF protection state
     state = generate_oauth_state()
 
-    client = Client()
     redirect_uri = str(request.url_for("logged_in"))
-    url = client.authorization_url(
+    url = _get_unauthenticated_client().authorization_url(
         client_id=get_client_id(),
         redirect_uri=redirect_uri,
         approval_prompt="auto",
@@ -139,8 +163,26 @@ def login(request: Request) -> HTMLResponse:
     )
 
 
+def _exchange_code_for_tokens(code: str) -> TokenDict:
+    """Exchange an authorization code for tokens (sync helper)."""
+    client = Client(requests_session=get_http_session())
+    token_response = client.exchange_code_for_token(
+        client_id=get_client_id(),
+        client_secret=get_client_secret(),
+        code=code,
+    )
+    return token_response_to_dict(token_response)
+
+
+def _fetch_athlete(access_token: str) -> Any:
+    """Fetch the athlete for a freshly issued access token (sync helper)."""
+    return Client(
+        access_token=access_token, requests_session=get_http_session()
+    ).get_athlete()
+
+
 @app.get("/strava-oauth", response_class=HTMLResponse)
-def logged_in(
+async def logged_in(
     request: Request,
     error: str | None = None,
     state: str | None = None,
@@ -186,14 +228,10 @@ def logged_in(
             },
         )
 
-    # Exchange code for tokens with error handling
+    # Exchange code for tokens with error handling. The stravalib calls are
+    # blocking, so run them off the event loop.
     try:
-        client = Client()
-        token_response = client.exchange_code_for_token(
-            client_id=get_client_id(),
-            client_secret=get_client_secret(),
-            code=code,
-        )
+        tokens = await asyncio.to_thread(_exchange_code_for_tokens, code)
     except requests.exceptions.HTTPError as e:
         error_msg = "Failed to exchange authorization code for tokens."
         if e.response is not None:
@@ -227,14 +265,12 @@ def logged_in(
             context={"error": f"An unexpected error occurred: {e}"},
         )
 
-    # Convert to dict and save tokens in memory for MCP server to use
-    tokens = token_response_to_dict(token_response)
+    # Save tokens in memory for MCP server to use
     save_tokens(tokens)
 
     # Get athlete info using the new access token
     try:
-        authenticated_client = Client(access_token=tokens["access_token"])
-        strava_athlete = authenticated_client.get_athlete()
+        strava_athlete = await asyncio.to_thread(_fetch_athlete, tokens["access_token"])
     except Exception:
         # Tokens saved successfully, but couldn't get athlete info
         # Still show success since authentication worked
@@ -3,35 +3,61 @@
 from __future__ import annotations
 
 import asyncio
+import calendar
 import functools
+import inspect
 import math
+import re
 import threading
-from collections.abc import Awaitable, Callable
-from datetime import datetime
-from typing import Any, ParamSpec
+import time
+from collections import OrderedDict
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from datetime import date, datetime
+from typing import Any, ParamSpec, TypeVar
+from urllib.parse import urlencode
 
 import requests
 import uvicorn
-from dotenv import load_dotenv
 from geopy.geocoders import Nominatim
 from mcp.server.fastmcp import FastMCP
 from stravalib import Client
+from stravalib.client import BatchedResultsIterator
+from stravalib.model import LatLon
+from stravalib.protocol import RequestMethod, Scope
+from stravalib.util.limiter import (
+    RateLimiter,
+    get_rates_from_response_headers,
+    get_seconds_until_next_day,
+    get_seconds_until_next_quarter,
+)
 
+from .oauth import app as oauth_app
 from .oauth import generate_oauth_state
 from .tokens import (
     TokenDict,
     delete_tokens,
     get_client_id,
     get_client_secret,
+    get_http_session,
     is_token_expired,
+    load_env,
     load_tokens,
+    on_tokens_changed,
     save_tokens,
     token_response_to_dict,
 )
 
 P = ParamSpec("P")
+R = TypeVar("R")
 
-load_dotenv(override=True)
+load_env()
 
 mcp = FastMCP("strava-mcp")
 
@@ -41,37 +67,64 @@ OAUTH_SERVER_PORT = 5050
 
 
 class OAuthServerManager:
-    """Manages the OAuth server lifecycle."""
+    """Manages the OAuth server lifecycle.
+
+    The OAuth server runs as a task on the MCP server's event loop rather than
+    in its own thread, so callbacks and tools share a single loop.
+    """
 
     def __init__(self) -> None:
-        self._thread: threading.Thread | None = None
+        self._config: uvicorn.Config | None = None
+        self._server: uvicorn.Server | None = None
+        self._task: asyncio.Task[None] | None = None
 
     def start(self) -> bool:
-        """Start the FastAPI OAuth server in a background thread.
+        """Start the FastAPI OAuth server on the running event loop.
+
+        Must be called from within the event loop (e.g. from a tool).
 
         Returns:
             True if server started successfully, False otherwise.
         """
-        if self._thread is not None and self._thread.is_alive():
+        if self._task is not None and not self._task.done():
             return True  # Already running
 
         try:
-            from .oauth import app
-
-            config = uvicorn.Config(
-                app,
-                host=OAUTH_SERVER_HOST,
-                port=OAUTH_SERVER_PORT,
-                log_level="warning",
-            )
-            server = uvicorn.Server(config)
-
-            self._thread = threading.Thread(target=server.run, daemon=True)
-            self._thread.start()
+            # Servers are single-use, but the config is built (and the app
+            # loaded) only once and reused if the server has to be restarted
+            if self._config is None:
+                self._config = uvicorn.Config(
+                    oauth_app,
+                    host=OAUTH_SERVER_HOST,
+                    port=OAUTH_SERVER_PORT,
+                    http="httptools",
+                    log_level="warning",
+                )
+            server = uvicorn.Server(self._config)
+
+            self._task = asyncio.get_running_loop().create_task(self._serve(server))
+            self._server = server
             return True
         except Exception:
             return False
 
+    async def stop(self) -> None:
+        """Ask the OAuth server to shut down and wait for it to finish."""
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._task is not None:
+            await self._task
+
+    @staticmethod
+    async def _serve(server: uvicorn.Server) -> None:
+        """Run the server, containing uvicorn's exit on startup failure."""
+        try:
+            await server.serve()
+        except SystemExit:
+            # uvicorn calls sys.exit() if it cannot bind the port. Keep the MCP
+            # server alive - manual authentication still works.
+            pass
+
 
 _oauth_manager = OAuthServerManager()
 
@@ -85,43 +138,203 @@ def start_oauth_server() -> bool:
     return _oauth_manager.start()
 
 
-# Lock for atomic token refresh to prevent concurrent refresh attempts
-_refresh_lock = threading.Lock()
+# Serializes token refresh across concurrent tool calls
+_refresh_lock = asyncio.Lock()
 
+# Caps Strava requests in flight across all tool calls, so parallel calls
+# queue instead of bursting into Strava's rate limits
+STRAVA_MAX_CONCURRENCY = 8
+_strava_semaphore = asyncio.Semaphore(STRAVA_MAX_CONCURRENCY)
 
-def get_authenticated_client() -> Client:
-    """Create an authenticated Strava client using stored tokens.
 
-    Thread-safe: Uses a lock to prevent concurrent token refresh attempts,
-    which could cause race conditions with the refresh token.
+class RateLimitExceededError(Exception):
+    """Raised instead of sending a request while Strava's quota is used up."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Strava rate limit reached, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class _RateLimitTracker(RateLimiter):
+    """Remembers Strava's rate-limit usage headers instead of sleeping on them.
+
+    stravalib's default limiter sleeps in the calling thread until the window
+    resets (up to a day), stalling the tool call and holding a concurrency
+    slot. This one only records when an exhausted window resets, so
+    _run_strava can refuse requests until then without a round trip.
+
+    A block only ever grows and lapses on its own: Strava reports separate
+    read and overall limits, so an under-quota response on one window says
+    nothing about another window that is used up. There is one block for
+    every request, so a used-up read window also refuses writes such as
+    update_activity_notes until it resets.
+
+    Responses are recorded from worker threads, so updates take a lock.
     """
-    with _refresh_lock:
-        tokens = load_tokens()
-
-        if not tokens or "refresh_token" not in tokens:
-            raise ValueError(
-                "Not authenticated. Use get_auth_url() to get the authorization URL, "
-                "then authenticate() with the code from the callback."
-            )
-
-        # Check if token is expired and refresh if needed
-        if is_token_expired(tokens):
-            client = Client()
-            token_response = client.refresh_access_token(
-                client_id=get_client_id(),
-                client_secret=get_client_secret(),
-                refresh_token=tokens["refresh_token"],
-            )
-            # Save refreshed tokens
-            tokens = token_response_to_dict(token_response)
-            save_tokens(tokens)
-
-    # Return client outside the lock (using the refreshed tokens)
-    return Client(
-        access_token=tokens["access_token"],
-        refresh_token=tokens["refresh_token"],
-        token_expires=int(tokens["expires_at"]),
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, args: dict[str, str], method: RequestMethod) -> None:
+        """Record the usage reported by a Strava response."""
+        rates = get_rates_from_response_headers(args, method)
+        if rates is None:
+            return
+        if rates.long_usage >= rates.long_limit:
+            blocked_until = time.time() + get_seconds_until_next_day()
+        elif rates.short_usage >= rates.short_limit:
+            blocked_until = time.time() + get_seconds_until_next_quarter()
+        else:
+            return
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, blocked_until)
+
+    def retry_after(self) -> int:
+        """Return seconds until requests may be sent again (0 if not limited)."""
+        return max(0, math.ceil(self._blocked_until - time.time()))
+
+
+# Shared by every authenticated client, so usage seen by one call applies to all
+_rate_limits = _RateLimitTracker()
+
+# Tokens are refreshed this many seconds before they expire, so one never
+# lapses between the check and the request
+TOKEN_REFRESH_MARGIN = 300
+
+# Until this time.time(), the stored tokens are known not to need a refresh
+_fresh_until = 0.0
+
+
+def _load_required_tokens() -> Mapping[str, Any]:
+    """Load stored tokens, raising if the user has not authenticated."""
+    tokens = load_tokens()
+    if not tokens or "refresh_token" not in tokens:
+        raise ValueError(
+            "Not authenticated. Use get_auth_url() to get the authorization URL, "
+            "then authenticate() with the code from the callback."
+        )
+    return tokens
+
+
+def _refresh_tokens(refresh_token: str) -> None:
+    """Exchange a refresh token for new tokens and store them (sync helper)."""
+    client = Client(requests_session=get_http_session(), rate_limiter=_rate_limits)
+    token_response = client.refresh_access_token(
+        client_id=get_client_id(),
+        client_secret=get_client_secret(),
+        refresh_token=refresh_token,
     )
+    save_tokens(token_response_to_dict(token_response))
+
+
+def _needs_refresh(tokens: Mapping[str, Any]) -> bool:
+    """Check whether tokens expire within TOKEN_REFRESH_MARGIN seconds."""
+    return tokens["expires_at"] - TOKEN_REFRESH_MARGIN < time.time()
+
+
+async def _ensure_fresh_tokens() -> None:
+    """Refresh the stored tokens if they have expired or are about to.
+
+    Once tokens are known to be fresh, calls return after a single clock
+    comparison until the refresh margin is reached or the tokens change.
+    Callers that find them stale queue on an asyncio.Lock and re-check under
+    it, so concurrent tool calls refresh once - and wait on the event loop
+    rather than in worker threads.
+    """
+    global _fresh_until
+    if time.time() < _fresh_until:
+        return
+
+    tokens = _load_required_tokens()
+    if _needs_refresh(tokens):
+        async with _refresh_lock:
+            # Another tool call may have refreshed while we waited for the lock
+            tokens = _load_required_tokens()
+            if _needs_refresh(tokens):
+                await asyncio.to_thread(_refresh_tokens, tokens["refresh_token"])
+                tokens = _load_required_tokens()
+    _fresh_until = tokens["expires_at"] - TOKEN_REFRESH_MARGIN
+
+
+async def _run_strava(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """Make sure tokens are fresh, then run a sync Strava helper in a thread.
+
+    At most STRAVA_MAX_CONCURRENCY helpers run at once; the rest wait on the
+    event loop for a slot. While Strava's rate limit is exhausted, raises
+    RateLimitExceededError instead of sending a request bound to fail.
+    """
+    await _ensure_fresh_tokens()
+    async with _strava_semaphore:
+        retry_after = _rate_limits.retry_after()
+        if retry_after:
+            raise RateLimitExceededError(retry_after)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+# The authenticated client for the current tokens, built on first use
+_client: Client | None = None
+_client_lock = threading.Lock()
+
+
+@on_tokens_changed
+def _forget_authenticated_client() -> None:
+    """Drop the cached client and freshness check so new tokens take effect."""
+    global _client, _fresh_until
+    with _client_lock:
+        _client = None
+        _fresh_until = 0.0
+
+
+def get_authenticated_client() -> Client:
+    """Return the Strava client for the stored tokens, creating it on first use.
+
+    The client is reused until the tokens change (login, refresh, logout).
+    Does not refresh: tools reach this through _run_strava, which has already
+    made sure the tokens are fresh.
+    """
+    global _client
+    client = _client
+    if client is None:
+        with _client_lock:
+            if _client is None:
+                tokens = _load_required_tokens()
+                _client = Client(
+                    access_token=tokens["access_token"],
+                    refresh_token=tokens["refresh_token"],
+                    token_expires=int(tokens["expires_at"]),
+                    requests_session=get_http_session(),
+                    rate_limiter=_rate_limits,
+                )
+            client = _client
+    return client
+
+
+def _adopt_authenticated_client(client: Client, tokens: TokenDict) -> None:
+    """Cache a client that already holds the stored access token.
+
+    Lets the first tool call after login reuse the client (and connection)
+    that exchanged the code. Skipped if the tokens changed again meanwhile.
+    """
+    global _client
+    client.refresh_token = tokens["refresh_token"]
+    client.token_expires = int(tokens["expires_at"])
+    with _client_lock:
+        current = load_tokens()
+        if current and current["access_token"] == tokens["access_token"]:
+            _client = client
+
+
+def _sized_pages(results: Iterator[R]) -> Iterator[R]:
+    """Shrink a stravalib result iterator's page size to its limit.
+
+    stravalib stops at the limit but always requests pages of 200, so a
+    limit=5 call would still download and validate 200 rows.
+    """
+    if isinstance(results, BatchedResultsIterator) and results.limit:
+        results.per_page = min(results.limit, results.per_page)
+    return results
 
 
 # =============================================================================
@@ -129,6 +342,122 @@ def get_authenticated_client() -> Client:
 # =============================================================================
 
 
+# Responses for HTTP errors with a well-known meaning, keyed by status code
+_HTTP_STATUS_ERRORS: dict[int, dict[str, Any]] = {
+    429: {
+        "error": "rate_limited",
+        "message": "Strava API rate limit exceeded",
+        "action": "Wait 15 minutes before retrying",
+        "retry_after_seconds": 900,
+    },
+    401: {
+        "error": "unauthorized",
+        "message": "Access token invalid or revoked",
+        "action": "Re-authenticate using get_auth_url()",
+    },
+    404: {
+        "error": "not_found",
+        "message": "Resource not found",
+        "action": "Verify the ID exists and you have access",
+    },
+    403: {
+        "error": "forbidden",
+        "message": "Access denied to this resource",
+        "action": "Check if you have permission to access this data",
+    },
+}
+
+# Fixed responses for failures that never depend on the exception's details
+_NETWORK_ERROR: dict[str, Any] = {
+    "error": "network_error",
+    "message": "Unable to connect to Strava API",
+    "action": "Check your internet connection",
+}
+_TIMEOUT_ERROR: dict[str, Any] = {
+    "error": "timeout",
+    "message": "Strava API request timed out",
+    "action": "Try again in a moment",
+}
+
+
+def _validation_error(e: Exception) -> dict[str, Any]:
+    # Authentication or validation errors
+    return {
+        "error": "validation_error",
+        "message": str(e),
+        "action": "Check authentication status with get_auth_status()",
+    }
+
+
+def _http_error(e: Exception) -> dict[str, Any]:
+    response = getattr(e, "response", None)
+    status_code = response.status_code if response is not None else None
+    if status_code == 401:
+        # Revoked token: don't keep serving data or a client built from it
+        _clear_response_caches()
+        _forget_authenticated_client()
+    known = _HTTP_STATUS_ERRORS.get(status_code) if status_code else None
+    if known is not None:
+        result = dict(known)
+        if status_code == 429 and _rate_limits.retry_after():
+            # Strava's headers say exactly when the exhausted window resets
+            result["retry_after_seconds"] = _rate_limits.retry_after()
+        return result
+    return {
+        "error": "api_error",
+        "message": str(e),
+        "status_code": status_code,
+    }
+
+
+def _local_rate_limit_error(e: Exception) -> dict[str, Any]:
+    # Refused locally: Strava's last response showed the quota used up
+    return {
+        "error": "rate_limited",
+        "message": "Strava API rate limit reached; request not sent",
+        "action": "Wait for the rate limit window to reset before retrying",
+        "retry_after_seconds": getattr(e, "retry_after", None),
+    }
+
+
+def _network_error(e: Exception) -> dict[str, Any]:
+    return dict(_NETWORK_ERROR)
+
+
+def _timeout_error(e: Exception) -> dict[str, Any]:
+    return dict(_TIMEOUT_ERROR)
+
+
+def _unexpected_error(e: Exception) -> dict[str, Any]:
+    # Catch-all for unexpected errors
+    return {
+        "error": "unexpected_error",
+        "message": str(e),
+        "type": type(e).__name__,
+    }
+
+
+_ERROR_HANDLERS: dict[type[Exception], Callable[[Exception], dict[str, Any]]] = {
+    ValueError: _validation_error,
+    RateLimitExceededError: _local_rate_limit_error,
+    requests.exceptions.HTTPError: _http_error,
+    requests.exceptions.ConnectionError: _network_error,
+    requests.exceptions.Timeout: _timeout_error,
+}
+
+
+@functools.cache
+def _error_handler_for(
+    exc_type: type[Exception],
+) -> Callable[[Exception], dict[str, Any]]:
+    """Resolve the handler for an exception type via its MRO (cached per type)."""
+    for cls in exc_type.__mro__:
+        handler = _ERROR_HANDLERS.get(cls)
+        if handler is not None:
+            return handler
+    return _unexpected_error
+
+
 def handle_strava_errors(
     func: Callable[P, Awaitable[dict[str, Any] | list[dict[str, Any]]]],
 ) -> Callable[P, Awaitable[dict[str, Any] | list[dict[str, Any]]]]:
@@ -144,74 +473,242 @@ def handle_strava_errors(
     ) -> dict[str, Any] | list[dict[str, Any]]:
         try:
             return await func(*args, **kwargs)
-        except ValueError as e:
-            # Authentication or validation errors
-            return {
-                "error": "validation_error",
-                "message": str(e),
-                "action": "Check authentication status with get_auth_status()",
-            }
-        except requests.exceptions.HTTPError as e:
-            if e.response is not None:
-                status_code = e.response.status_code
-                if status_code == 429:
-                    return {
-                        "error": "rate_limited",
-                        "message": "Strava API rate limit exceeded",
-                        "action": "Wait 15 minutes before retrying",
-                        "retry_after_seconds": 900,
-                    }
-                elif status_code == 401:
-                    return {
-                        "error": "unauthorized",
-                        "message": "Access token invalid or revoked",
-                        "action": "Re-authenticate using get_auth_url()",
-                    }
-                elif status_code == 404:
-                    return {
-                        "error": "not_found",
-                        "message": "Resource not found",
-                        "action": "Verify the ID exists and you have access",
-                    }
-                elif status_code == 403:
-                    return {
-                        "error": "forbidden",
-                        "message": "Access denied to this resource",
-                        "action": "Check if you have permission to access this data",
-                    }
-            return {
-                "error": "api_error",
-                "message": str(e),
-                "status_code": e.response.status_code if e.response else None,
-            }
-        except requests.exceptions.ConnectionError:
-            return {
-                "error": "network_error",
-                "message": "Unable to connect to Strava API",
-                "action": "Check your internet connection",
-            }
-        except requests.exceptions.Timeout:
-            return {
-                "error": "timeout",
-                "message": "Strava API request timed out",
-                "action": "Try again in a moment",
-            }
         except Exception as e:
-            # Catch-all for unexpected errors
-            return {
-                "error": "unexpected_error",
-                "message": str(e),
-                "type": type(e).__name__,
-            }
+            return _error_handler_for(type(e))(e)
 
     return wrapper
 
 
+def validate_args(
+    *ids: str, max_limit: int | None = None
+) -> Callable[
+    [Callable[P, Awaitable[dict[str, Any] | list[dict[str, Any]]]]],
+    Callable[P, Awaitable[dict[str, Any] | list[dict[str, Any]]]],
+]:
+    """Decorator for the argument checks shared by most tools.
+
+    Each named id argument must be a positive integer (None is allowed for
+    optional ids). A `limit` argument, if the tool has one, must be at least 1
+    and is capped at max_limit when given. Failures return a validation_error
+    dict without calling the tool.
+    """
+
+    def decorator(
+        func: Callable[P, Awaitable[dict[str, Any] | list[dict[str, Any]]]],
+    ) -> Callable[P, Awaitable[dict[str, Any] | list[dict[str, Any]]]]:
+        signature = inspect.signature(func)
+        has_limit = "limit" in signature.parameters
+
+        @functools.wraps(func)
+        async def wrapper(
+            *args: P.args, **kwargs: P.kwargs
+        ) -> dict[str, Any] | list[dict[str, Any]]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+
+            for name in ids:
+                value = arguments[name]
+                if value is not None and value < 1:
+                    return {
+                        "error": "validation_error",
+                        "message": f"{name} must be a positive integer",
+                    }
+
+            if has_limit:
+                limit = arguments["limit"]
+                if limit is not None:
+                    if limit < 1:
+                        return {
+                            "error": "validation_error",
+                            "message": "limit must be at least 1",
+                        }
+                    if max_limit is not None:
+                        arguments["limit"] = min(limit, max_limit)
+
+            return await func(*bound.args, **bound.kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self._ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop one entry, if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+
+# Objects that rarely change, cached briefly by id so repeated tool calls skip
+# the round trip. They can include private data (e.g. routes), so they are
+# dropped whenever the stored tokens change. update_activity_notes drops the
+# activity it edits.
+_segment_cache = _TTLCache(maxsize=1024, ttl=300)
+_club_cache = _TTLCache(maxsize=1024, ttl=300)
+_route_cache = _TTLCache(maxsize=1024, ttl=300)
+_activity_cache = _TTLCache(maxsize=1024, ttl=300)
+
+# The athlete's own profile and stats change as new activities come in, so
+# they are only reused for a minute
+_athlete_cache = _TTLCache(maxsize=1, ttl=60)
+_athlete_stats_cache = _TTLCache(maxsize=64, ttl=60)
+
+# The authenticated athlete's id, looked up at most once per set of tokens
+_athlete_id: int | None = None
+
+# Bumped each time the caches are cleared. A fetch that started under the
+# previous tokens sees a different generation when it finishes and doesn't
+# write its response back.
+_cache_generation = 0
+_cache_generation_lock = threading.Lock()
+
+
+@on_tokens_changed
+def _clear_response_caches() -> None:
+    """Forget cached Strava responses (on login, refresh, logout and 401s)."""
+    global _athlete_id, _cache_generation
+    with _cache_generation_lock:
+        _cache_generation += 1
+        _segment_cache.clear()
+        _club_cache.clear()
+        _route_cache.clear()
+        _activity_cache.clear()
+        _athlete_cache.clear()
+        _athlete_stats_cache.clear()
+        _athlete_id = None
+
+
+def _remember_athlete_id(athlete_id: int | None, generation: int) -> int:
+    """Cache the athlete id Strava returned, unless the tokens changed since.
+
+    generation is the cache generation read before the athlete was fetched.
+    """
+    global _athlete_id
+    if athlete_id is None:
+        raise ValueError("Strava did not return the authenticated athlete's id.")
+    with _cache_generation_lock:
+        if generation == _cache_generation:
+            _athlete_id = athlete_id
+    return athlete_id
+
+
+def _authenticated_athlete_id(client: Client) -> int:
+    """Return the authenticated athlete's id, fetching it only on first use."""
+    athlete_id = _athlete_id
+    if athlete_id is None:
+        generation = _cache_generation
+        athlete_id = _remember_athlete_id(client.get_athlete().id, generation)
+    return athlete_id
+
+
+async def _fetch_cached(
+    cache: _TTLCache, fetch: Callable[..., dict[str, Any]], *args: Hashable
+) -> dict[str, Any]:
+    """Return a cached response, or run the sync fetch helper and cache it.
+
+    Responses are keyed by the helper's arguments. A response is not cached
+    if the tokens changed while it was being fetched.
+    """
+    result = cache.get(args)
+    if result is None:
+        generation = _cache_generation
+        result = await _run_strava(fetch, *args)
+        with _cache_generation_lock:
+            if generation == _cache_generation:
+                cache.set(args, result)
+    return result
+
+
+# Bulk tools fetch at most this many items, this many at a time, to stay well
+# inside Strava's rate limits (100 requests per 15 minutes by default)
+BULK_MAX_ITEMS = 20
+BULK_CONCURRENCY = 4
+
+
+async def _fetch_many(
+    cache: _TTLCache, fetch: Callable[[int], dict[str, Any]], ids: list[int]
+) -> list[dict[str, Any]]:
+    """Run a cached sync fetch helper for each id concurrently.
+
+    Results keep the order of ids. A failed fetch yields the same error dict
+    handle_strava_errors would return, tagged with its id, so one missing item
+    doesn't sink the whole batch.
+    """
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def fetch_one(item_id: int) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                return await _fetch_cached(cache, fetch, item_id)
+            except Exception as e:
+                return {"id": item_id, **_error_handler_for(type(e))(e)}
+
+    return list(await asyncio.gather(*(fetch_one(i) for i in ids)))
+
+
+def _validate_bulk_ids(ids: list[int], name: str) -> dict[str, Any] | None:
+    """Return a validation error for a bad bulk id list, or None if it's fine."""
+    if not ids:
+        return {"error": "validation_error", "message": f"{name} cannot be empty"}
+    if len(ids) > BULK_MAX_ITEMS:
+        return {
+            "error": "validation_error",
+            "message": f"{name} accepts at most {BULK_MAX_ITEMS} ids per call",
+        }
+    if any(i < 1 for i in ids):
+        return {
+            "error": "validation_error",
+            "message": f"{name} must contain only positive integers",
+        }
+    return None
+
+
 # =============================================================================
 # Authentication Tools
 # =============================================================================
 
 
+@functools.lru_cache(maxsize=4)
+def _expires_at_iso(expires_at: float) -> str:
+    """Format a token expiry timestamp, memoized since it only changes on refresh."""
+    return datetime.fromtimestamp(expires_at).isoformat()
+
+
 @mcp.tool()
 async def get_auth_status() -> dict[str, Any]:
     """Check current Strava authentication status.
@@ -232,9 +729,7 @@ async def get_auth_status() -> dict[str, Any]:
 
     return {
         "authenticated": True,
-        "token_expires_at": (
-            datetime.fromtimestamp(expires_at).isoformat() if expires_at else None
-        ),
+        "token_expires_at": (_expires_at_iso(expires_at) if expires_at else None),
         "is_expired": is_expired,
         "message": (
             "Token expired, will auto-refresh on next API call."
@@ -244,22 +739,37 @@ async def get_auth_status() -> dict[str, Any]:
     }
 
 
-def _build_auth_url(redirect_uri: str) -> str:
-    """Build Strava authorization URL (sync helper for asyncio.to_thread)."""
-    client = Client()
-    state = generate_oauth_state()
-    return client.authorization_url(
-        client_id=get_client_id(),
+# Permissions requested from the athlete. activity:write is needed by
+# update_activity_notes.
+OAUTH_SCOPE: tuple[Scope, ...] = (
+    "read",
+    "activity:read",
+    "activity:read_all",
+    "activity:write",
+    "profile:read_all",
+)
+
+
+@functools.cache
+def _get_unauthenticated_client() -> Client:
+    """Return a shared client for stateless calls like authorization_url."""
+    return Client()
+
+
+@functools.lru_cache(maxsize=8)
+def _auth_url_without_state(redirect_uri: str, client_id: int) -> str:
+    """Build the authorization URL minus the state, cached per redirect URI.
+
+    Everything but the CSRF state is fixed for a given redirect URI and client
+    id, so the URL is only formatted once. The client id is part of the key so
+    a .env reload with a new app takes effect. The state must be fresh on
+    every call.
+    """
+    return _get_unauthenticated_client().authorization_url(
+        client_id=client_id,
         redirect_uri=redirect_uri,
         approval_prompt="auto",
-        scope=[
-            "read",
-            "activity:read",
-            "activity:read_all",
-            "activity:write",
-            "profile:read_all",
-        ],
-        state=state,
+        scope=list(OAUTH_SCOPE),
     )
 
 
@@ -282,7 +792,10 @@ async def get_auth_url(
     # Ensure OAuth server is running
     start_oauth_server()
 
-    url = await asyncio.to_thread(_build_auth_url, redirect_uri)
+    # Pure string formatting - no I/O, so no need for a worker thread
+    state = generate_oauth_state()
+    base_url = _auth_url_without_state(redirect_uri, get_client_id())
+    url = f"{base_url}&{urlencode({'state': state})}"
 
     return {
         "auth_url": url,
@@ -297,8 +810,13 @@ async def get_auth_url(
 
 
 def _exchange_and_get_athlete(code: str) -> tuple[TokenDict, Any]:
-    """Exchange auth code for tokens and get athlete (sync helper)."""
-    client = Client()
+    """Exchange auth code for tokens and get athlete (sync helper).
+
+    Both calls go through one client: the exchange sets its access token, and
+    the athlete request reuses the same pooled HTTPS connection. The client
+    then becomes the cached authenticated client for later tool calls.
+    """
+    client = Client(requests_session=get_http_session(), rate_limiter=_rate_limits)
     token_response = client.exchange_code_for_token(
         client_id=get_client_id(),
         client_secret=get_client_secret(),
@@ -306,9 +824,11 @@ def _exchange_and_get_athlete(code: str) -> tuple[TokenDict, Any]:
     )
     tokens = token_response_to_dict(token_response)
     save_tokens(tokens)
+    _adopt_authenticated_client(client, tokens)
 
-    authenticated_client = Client(access_token=tokens["access_token"])
-    athlete = authenticated_client.get_athlete()
+    generation = _cache_generation
+    athlete = client.get_athlete()
+    _remember_athlete_id(athlete.id, generation)
     return tokens, athlete
 
 
@@ -339,7 +859,7 @@ async def authenticate(code: str) -> dict[str, Any]:
         "success": True,
         "message": f"Successfully authenticated as {athlete.firstname} {athlete.lastname}",
         "athlete_id": athlete.id,
-        "expires_at": datetime.fromtimestamp(tokens["expires_at"]).isoformat(),
+        "expires_at": _expires_at_iso(tokens["expires_at"]),
     }
 
 
@@ -362,17 +882,53 @@ async def logout() -> dict[str, Any]:
 # =============================================================================
 
 
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})", re.ASCII)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_date(value: str) -> datetime | None:
+    """Parse a date filter, returning None if it isn't a valid date.
+
+    The documented YYYY-MM-DD form is matched with a precompiled regex; any
+    other ISO 8601 string falls back to datetime.fromisoformat. Memoized,
+    since agents tend to repeat the same few date bounds.
+    """
+    m = _DATE_RE.fullmatch(value)
+    try:
+        if m:
+            return datetime(int(m[1]), int(m[2]), int(m[3]))
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _to_epoch(dt: datetime) -> int:
+    """Convert a datetime to a Unix timestamp, treating naive values as UTC."""
+    return calendar.timegm(dt.utctimetuple())
+
+
 def _fetch_activities(
     after_dt: datetime | None, before_dt: datetime | None, limit: int
 ) -> list[dict[str, Any]]:
-    """Fetch activities from Strava (sync helper)."""
+    """Fetch activities from Strava as raw JSON (sync helper).
+
+    Goes through stravalib's protocol layer rather than get_activities() so
+    the response skips pydantic validation and the model_dump() round trip.
+    limit never exceeds Strava's 200 per-page maximum, so one page suffices.
+    """
     client = get_authenticated_client()
-    activities = client.get_activities(after=after_dt, before=before_dt, limit=limit)
-    return [activity.model_dump() for activity in activities]
+    return client.protocol.get(
+        "/athlete/activities",
+        after=_to_epoch(after_dt) if after_dt else None,
+        before=_to_epoch(before_dt) if before_dt else None,
+        per_page=limit,
+        page=1,
+    )
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args(max_limit=200)
 async def get_activities(
     after: str | None = None,
     before: str | None = None,
@@ -388,17 +944,11 @@ async def get_activities(
     Returns:
         List of activity summaries with key details.
     """
-    # Validate limit
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)  # Cap at Strava's maximum
-
     # Validate and parse dates
     after_dt = None
     if after:
-        try:
-            after_dt = datetime.fromisoformat(after)
-        except ValueError:
+        after_dt = _parse_date(after)
+        if after_dt is None:
             return {
                 "error": "validation_error",
                 "message": f"Invalid date format '{after}'. Use ISO format: YYYY-MM-DD",
@@ -406,21 +956,20 @@ async def get_activities(
 
     before_dt = None
     if before:
-        try:
-            before_dt = datetime.fromisoformat(before)
-        except ValueError:
+        before_dt = _parse_date(before)
+        if before_dt is None:
             return {
                 "error": "validation_error",
                 "message": f"Invalid date format '{before}'. Use ISO format: YYYY-MM-DD",
             }
 
-    return await asyncio.to_thread(_fetch_activities, after_dt, before_dt, limit)
+    return await _run_strava(_fetch_activities, after_dt, before_dt, limit)
 
 
 def _fetch_athlete() -> dict[str, Any]:
     """Fetch athlete profile from Strava (sync helper)."""
     client = get_authenticated_client()
-    return client.get_athlete().model_dump()
+    return client.get_athlete().model_dump(exclude_none=True)
 
 
 @mcp.tool()
@@ -431,17 +980,18 @@ async def get_athlete() -> dict[str, Any]:
     Returns:
         Athlete profile with name, stats, and other details.
     """
-    return await asyncio.to_thread(_fetch_athlete)
+    return await _fetch_cached(_athlete_cache, _fetch_athlete)
 
 
 def _fetch_athlete_stats(athlete_id: int | None) -> dict[str, Any]:
     """Fetch athlete stats from Strava (sync helper)."""
     client = get_authenticated_client()
-    return client.get_athlete_stats(athlete_id=athlete_id).model_dump()
+    return client.get_athlete_stats(athlete_id=athlete_id).model_dump(exclude_none=True)
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("athlete_id")
 async def get_athlete_stats(athlete_id: int | None = None) -> dict[str, Any]:
     """Get statistics for the authenticated athlete or a specific athlete.
 
@@ -451,23 +1001,23 @@ async def get_athlete_stats(athlete_id: int | None = None) -> dict[str, Any]:
     Returns:
         Athlete statistics including recent (last 4 weeks), year-to-date, and all-time totals.
     """
-    if athlete_id is not None and athlete_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "athlete_id must be a positive integer",
-        }
-
-    return await asyncio.to_thread(_fetch_athlete_stats, athlete_id)
+    return await _fetch_cached(_athlete_stats_cache, _fetch_athlete_stats, athlete_id)
 
 
 def _fetch_activity_details(activity_id: int) -> dict[str, Any]:
-    """Fetch activity details from Strava (sync helper)."""
+    """Fetch activity details from Strava (sync helper).
+
+    Fields Strava left empty are dropped: most of stravalib's ~80 activity
+    fields are None for a typical activity, and every one of them would
+    otherwise be serialized into the tool result.
+    """
     client = get_authenticated_client()
-    return client.get_activity(activity_id).model_dump()
+    return client.get_activity(activity_id).model_dump(exclude_none=True)
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("activity_id")
 async def get_activity_details(activity_id: int) -> dict[str, Any]:
     """Get detailed information about a specific Strava activity.
 
@@ -477,13 +1027,35 @@ async def get_activity_details(activity_id: int) -> dict[str, Any]:
     Returns:
         Detailed activity information including description, gear, and splits.
     """
-    if activity_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "activity_id must be a positive integer",
-        }
+    return await _fetch_cached(_activity_cache, _fetch_activity_details, activity_id)
 
-    return await asyncio.to_thread(_fetch_activity_details, activity_id)
+
+@mcp.tool()
+@handle_strava_errors
+async def get_activities_details(activity_ids: list[int]) -> dict[str, Any]:
+    """Get detailed information about several activities in one call.
+
+    Activities are fetched concurrently, so this is faster than calling
+    get_activity_details once per id (e.g. for ids from get_activities).
+
+    Args:
+        activity_ids: Up to 20 activity IDs. Duplicates are fetched once.
+
+    Returns:
+        Activity details in the order requested. Activities that could not be
+        fetched appear as error entries with their id.
+    """
+    error = _validate_bulk_ids(activity_ids, "activity_ids")
+    if error:
+        return error
+
+    # Fail fast (and refresh at most once) before fanning out
+    await _ensure_fresh_tokens()
+
+    activities = await _fetch_many(
+        _activity_cache, _fetch_activity_details, list(dict.fromkeys(activity_ids))
+    )
+    return {"count": len(activities), "activities": activities}
 
 
 def _update_activity_description(activity_id: int, description: str) -> dict[str, Any]:
@@ -499,6 +1071,7 @@ def _update_activity_description(activity_id: int, description: str) -> dict[str
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("activity_id")
 async def update_activity_notes(activity_id: int, notes: str) -> dict[str, Any]:
     """Update the notes/description of an activity.
 
@@ -509,12 +1082,6 @@ async def update_activity_notes(activity_id: int, notes: str) -> dict[str, Any]:
     Returns:
         Updated activity info with the new description.
     """
-    if activity_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "activity_id must be a positive integer",
-        }
-
     notes = notes.strip()
     if not notes:
         return {
@@ -522,7 +1089,8 @@ async def update_activity_notes(activity_id: int, notes: str) -> dict[str, Any]:
             "message": "notes cannot be empty",
         }
 
-    result = await asyncio.to_thread(_update_activity_description, activity_id, notes)
+    result = await _run_strava(_update_activity_description, activity_id, notes)
+    _activity_cache.pop((activity_id,))
 
     return {
         "success": True,
@@ -535,29 +1103,92 @@ async def update_activity_notes(activity_id: int, notes: str) -> dict[str, Any]:
 # Geocoding Tools
 # =============================================================================
 
-# Nominatim geocoder (uses OpenStreetMap - free, no API key required)
+# Nominatim geocoder (uses OpenStreetMap - free, no API key required). geopy's
+# requests adapter keeps one pooled session per geocoder, so calls reuse TLS.
 _geocoder = Nominatim(user_agent="strava-mcp/1.0")
 
 
-def _geocode_location(query: str, radius_km: float) -> dict[str, Any]:
-    """Geocode a location and return bounds (sync helper)."""
+class _Throttle:
+    """Space calls at least min_interval seconds apart.
+
+    Each caller reserves the next free slot under a short lock and then sleeps
+    on the event loop, so waiting never ties up a worker thread.
+    """
+
+    def __init__(self, min_interval: float) -> None:
+        self._min_interval = min_interval
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    async def wait(self) -> None:
+        """Sleep until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self._min_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+# Nominatim's usage policy allows at most one request per second
+_nominatim_throttle = _Throttle(min_interval=1.0)
+
+
+# Degrees of latitude per kilometre (1 degree ≈ 111km)
+_INV_DEG_KM = 1.0 / 111.0
+
+# Geocoded places keyed by normalized query. In memory only, like tokens.
+_GEOCODE_CACHE_SIZE = 256
+_geocode_cache: OrderedDict[str, tuple[float, float, str]] = OrderedDict()
+_geocode_cache_lock = threading.Lock()
+
+
+def _cached_place(key: str) -> tuple[float, float, str] | None:
+    """Return a cached (lat, lng, address) for a normalized query, if any."""
+    with _geocode_cache_lock:
+        place = _geocode_cache.get(key)
+        if place is not None:
+            _geocode_cache.move_to_end(key)
+        return place
+
+
+def _cache_place(key: str, place: tuple[float, float, str]) -> None:
+    """Remember a geocoded place, evicting the least recently used entry."""
+    with _geocode_cache_lock:
+        _geocode_cache[key] = place
+        _geocode_cache.move_to_end(key)
+        if len(_geocode_cache) > _GEOCODE_CACHE_SIZE:
+            _geocode_cache.popitem(last=False)
+
+
+def _geocode_place(query: str) -> tuple[float, float, str]:
+    """Look up a place on Nominatim and cache it (sync helper)."""
     location = _geocoder.geocode(query, exactly_one=True)
 
     if not location:
         raise ValueError(f"Could not find location: {query}")
 
-    lat, lng = location.latitude, location.longitude
+    place = (location.latitude, location.longitude, location.address)
+    _cache_place(query.lower(), place)
+    return place
+
+
+def _location_bounds(
+    query: str, place: tuple[float, float, str], radius_km: float
+) -> dict[str, Any]:
+    """Build the geocode result, with bounds around the place's center."""
+    lat, lng, address = place
 
     # Calculate bounds from center point and radius
     # Rough approximation: 1 degree latitude ≈ 111km
     # 1 degree longitude ≈ 111km * cos(latitude)
-    lat_offset = radius_km / 111.0
-    lng_offset = radius_km / (111.0 * math.cos(math.radians(lat)))
+    lat_offset = radius_km * _INV_DEG_KM
+    lng_offset = lat_offset / math.cos(math.radians(lat))
 
     return {
         "query": query,
         "location": {
-            "name": location.address,
+            "name": address,
             "latitude": lat,
             "longitude": lng,
         },
@@ -571,6 +1202,22 @@ def _geocode_location(query: str, radius_km: float) -> dict[str, Any]:
     }
 
 
+def _validate_radius(radius_km: float) -> dict[str, Any] | None:
+    """Return a validation error for an out-of-range radius, or None."""
+    if radius_km <= 0:
+        return {
+            "error": "validation_error",
+            "message": "radius_km must be positive",
+        }
+
+    if radius_km > 50:
+        return {
+            "error": "validation_error",
+            "message": "radius_km must be <= 50km to avoid too large search areas",
+        }
+    return None
+
+
 @mcp.tool()
 @handle_strava_errors
 async def geocode_location(
@@ -589,19 +1236,54 @@ async def geocode_location(
     if not query or not query.strip():
         return {"error": "validation_error", "message": "Query cannot be empty"}
 
-    if radius_km <= 0:
-        return {
-            "error": "validation_error",
-            "message": "radius_km must be positive",
-        }
+    error = _validate_radius(radius_km)
+    if error:
+        return error
 
-    if radius_km > 50:
+    query = query.strip()
+    place = _cached_place(query.lower())
+    if place is None:
+        await _nominatim_throttle.wait()
+        place = await asyncio.to_thread(_geocode_place, query)
+
+    # Cache hits never leave the event loop; the bounds math is trivial
+    return _location_bounds(query, place, radius_km)
+
+
+@mcp.tool()
+@handle_strava_errors
+async def geocode_locations(
+    queries: list[str],
+    radius_km: float = 5.0,
+) -> dict[str, Any]:
+    """Convert several location names to geographic bounds in one call.
+
+    Previously geocoded places are answered from cache straight away; the rest
+    are looked up back to back at Nominatim's limit of one per second.
+
+    Args:
+        queries: Up to 20 location names. Duplicates are looked up once.
+        radius_km: Search radius in kilometers from each center (default 5.0).
+
+    Returns:
+        Results keyed by query, each shaped like geocode_location's result or
+        an error entry if that location could not be found.
+    """
+    unique = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if not unique:
+        return {"error": "validation_error", "message": "queries cannot be empty"}
+    if len(unique) > BULK_MAX_ITEMS:
         return {
             "error": "validation_error",
-            "message": "radius_km must be <= 50km to avoid too large search areas",
+            "message": f"queries accepts at most {BULK_MAX_ITEMS} locations per call",
         }
 
-    return await asyncio.to_thread(_geocode_location, query.strip(), radius_km)
+    error = _validate_radius(radius_km)
+    if error:
+        return error
+
+    results = await asyncio.gather(*(geocode_location(q, radius_km) for q in unique))
+    return {"count": len(unique), "locations": dict(zip(unique, results))}
 
 
 # =============================================================================
@@ -612,6 +1294,15 @@ STRAVA_SEGMENT_WEB_URL = "https://www.strava.com/segments"
 STRAVA_SEGMENT_APP_URL = "strava://segments"
 
 
+def _latlng(value: LatLon | None) -> Sequence[float] | None:
+    """Return the [lat, lng] pair wrapped by a stravalib LatLon, or None.
+
+    LatLon is a pydantic root model, so list(value) would iterate its fields
+    rather than the coordinates; the wrapped list is returned as-is.
+    """
+    return value.root if value else None
+
+
 def _explore_segments(
     bounds: tuple[float, float, float, float],
     activity_type: str,
@@ -627,15 +1318,14 @@ def _explore_segments(
         max_cat=max_cat,
     )
 
-    results = []
-    for seg in segments:
-        segment_data = {
+    return [
+        {
             "id": seg.id,
             "name": seg.name,
             "climb_category": seg.climb_category,
             "avg_grade": seg.avg_grade,
-            "start_latlng": list(seg.start_latlng) if seg.start_latlng else None,
-            "end_latlng": list(seg.end_latlng) if seg.end_latlng else None,
+            "start_latlng": _latlng(seg.start_latlng),
+            "end_latlng": _latlng(seg.end_latlng),
             "elev_difference": seg.elev_difference,
             "distance": seg.distance,
             "links": {
@@ -643,9 +1333,8 @@ def _explore_segments(
                 "app": f"{STRAVA_SEGMENT_APP_URL}/{seg.id}",
             },
         }
-        results.append(segment_data)
-
-    return results
+        for seg in segments
+    ]
 
 
 @mcp.tool()
@@ -718,7 +1407,7 @@ async def explore_running_segments(
             "message": "max_cat must be between 0 and 5",
         }
 
-    segments = await asyncio.to_thread(
+    segments = await _run_strava(
         _explore_segments, bounds_tuple, "running", min_cat, max_cat
     )
 
@@ -751,8 +1440,8 @@ def _fetch_segment(segment_id: int) -> dict[str, Any]:
         "city": segment.city,
         "state": segment.state,
         "country": segment.country,
-        "start_latlng": list(segment.start_latlng) if segment.start_latlng else None,
-        "end_latlng": list(segment.end_latlng) if segment.end_latlng else None,
+        "start_latlng": _latlng(segment.start_latlng),
+        "end_latlng": _latlng(segment.end_latlng),
         "effort_count": segment.effort_count,
         "athlete_count": segment.athlete_count,
         "star_count": segment.star_count,
@@ -766,6 +1455,7 @@ def _fetch_segment(segment_id: int) -> dict[str, Any]:
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("segment_id")
 async def get_segment(segment_id: int) -> dict[str, Any]:
     """Get detailed information about a specific segment.
 
@@ -775,13 +1465,35 @@ async def get_segment(segment_id: int) -> dict[str, Any]:
     Returns:
         Full segment details including polyline, stats, and deeplinks.
     """
-    if segment_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "segment_id must be a positive integer",
-        }
+    return await _fetch_cached(_segment_cache, _fetch_segment, segment_id)
+
 
-    return await asyncio.to_thread(_fetch_segment, segment_id)
+@mcp.tool()
+@handle_strava_errors
+async def get_segments_bulk(segment_ids: list[int]) -> dict[str, Any]:
+    """Get detailed information about several segments in one call.
+
+    Segments are fetched concurrently, so this is faster than calling
+    get_segment once per id.
+
+    Args:
+        segment_ids: Up to 20 segment IDs. Duplicates are fetched once.
+
+    Returns:
+        Segment details in the order requested. Segments that could not be
+        fetched appear as error entries with their id.
+    """
+    error = _validate_bulk_ids(segment_ids, "segment_ids")
+    if error:
+        return error
+
+    # Fail fast (and refresh at most once) before fanning out
+    await _ensure_fresh_tokens()
+
+    segments = await _fetch_many(
+        _segment_cache, _fetch_segment, list(dict.fromkeys(segment_ids))
+    )
+    return {"count": len(segments), "segments": segments}
 
 
 # =============================================================================
@@ -796,19 +1508,18 @@ def _format_timestamp(ts: Any) -> str | None:
     """Format a timestamp to ISO string, handling various types."""
     if ts is None:
         return None
-    if hasattr(ts, "isoformat"):
-        return ts.isoformat()  # type: ignore[no-any-return]
+    if isinstance(ts, date):  # Covers datetime, a date subclass
+        return ts.isoformat()
     return str(ts)
 
 
 def _fetch_routes(athlete_id: int | None, limit: int) -> list[dict[str, Any]]:
     """Fetch athlete routes (sync helper)."""
     client = get_authenticated_client()
-    routes = client.get_routes(athlete_id=athlete_id, limit=limit)
+    routes = _sized_pages(client.get_routes(athlete_id=athlete_id, limit=limit))
 
-    results = []
-    for route in routes:
-        route_data = {
+    return [
+        {
             "id": route.id,
             "name": route.name,
             "description": route.description,
@@ -823,13 +1534,13 @@ def _fetch_routes(athlete_id: int | None, limit: int) -> list[dict[str, Any]]:
                 "app": f"{STRAVA_ROUTE_APP_URL}/{route.id}",
             },
         }
-        results.append(route_data)
-
-    return results
+        for route in routes
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args(max_limit=200)
 async def get_my_routes(
     limit: int = 20,
 ) -> dict[str, Any] | list[dict[str, Any]]:
@@ -841,11 +1552,7 @@ async def get_my_routes(
     Returns:
         List of routes with details and deeplinks.
     """
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)
-
-    routes = await asyncio.to_thread(_fetch_routes, None, limit)
+    routes = await _run_strava(_fetch_routes, None, limit)
 
     return {
         "count": len(routes),
@@ -891,6 +1598,7 @@ def _fetch_route(route_id: int) -> dict[str, Any]:
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("route_id")
 async def get_route(route_id: int) -> dict[str, Any]:
     """Get detailed information about a specific route.
 
@@ -900,13 +1608,7 @@ async def get_route(route_id: int) -> dict[str, Any]:
     Returns:
         Full route details including polyline, segments, and deeplinks.
     """
-    if route_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "route_id must be a positive integer",
-        }
-
-    return await asyncio.to_thread(_fetch_route, route_id)
+    return await _fetch_cached(_route_cache, _fetch_route, route_id)
 
 
 # =============================================================================
@@ -920,11 +1622,10 @@ STRAVA_CLUB_APP_URL = "strava://clubs"
 def _fetch_athlete_clubs(limit: int | None) -> list[dict[str, Any]]:
     """Fetch athlete's clubs (sync helper)."""
     client = get_authenticated_client()
-    clubs = client.get_athlete_clubs(limit=limit)
+    clubs = _sized_pages(client.get_athlete_clubs(limit=limit))
 
-    results = []
-    for club in clubs:
-        club_data = {
+    return [
+        {
             "id": club.id,
             "name": club.name,
             "sport_type": club.sport_type,
@@ -939,13 +1640,13 @@ def _fetch_athlete_clubs(limit: int | None) -> list[dict[str, Any]]:
                 "app": f"{STRAVA_CLUB_APP_URL}/{club.id}",
             },
         }
-        results.append(club_data)
-
-    return results
+        for club in clubs
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args()
 async def get_my_clubs(
     limit: int | None = None,
 ) -> dict[str, Any] | list[dict[str, Any]]:
@@ -957,10 +1658,7 @@ async def get_my_clubs(
     Returns:
         List of clubs with details and deeplinks.
     """
-    if limit is not None and limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-
-    clubs = await asyncio.to_thread(_fetch_athlete_clubs, limit)
+    clubs = await _run_strava(_fetch_athlete_clubs, limit)
 
     return {
         "count": len(clubs),
@@ -995,6 +1693,7 @@ def _fetch_club(club_id: int) -> dict[str, Any]:
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("club_id")
 async def get_club(club_id: int) -> dict[str, Any]:
     """Get detailed information about a specific club.
 
@@ -1004,35 +1703,28 @@ async def get_club(club_id: int) -> dict[str, Any]:
     Returns:
         Full club details including description and deeplinks.
     """
-    if club_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "club_id must be a positive integer",
-        }
-
-    return await asyncio.to_thread(_fetch_club, club_id)
+    return await _fetch_cached(_club_cache, _fetch_club, club_id)
 
 
 def _fetch_club_members(club_id: int, limit: int | None) -> list[dict[str, Any]]:
     """Fetch club members (sync helper)."""
     client = get_authenticated_client()
-    members = client.get_club_members(club_id, limit=limit)
+    members = _sized_pages(client.get_club_members(club_id, limit=limit))
 
-    results = []
-    for member in members:
-        member_data = {
+    return [
+        {
             "firstname": member.firstname,
             "lastname": member.lastname,
             "admin": member.admin,
             "owner": member.owner,
         }
-        results.append(member_data)
-
-    return results
+        for member in members
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("club_id", max_limit=200)
 async def get_club_members(
     club_id: int,
     limit: int = 30,
@@ -1046,16 +1738,7 @@ async def get_club_members(
     Returns:
         List of club members with basic profile info.
     """
-    if club_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "club_id must be a positive integer",
-        }
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)
-
-    members = await asyncio.to_thread(_fetch_club_members, club_id, limit)
+    members = await _run_strava(_fetch_club_members, club_id, limit)
 
     return {
         "club_id": club_id,
@@ -1067,11 +1750,10 @@ async def get_club_members(
 def _fetch_club_activities(club_id: int, limit: int | None) -> list[dict[str, Any]]:
     """Fetch club activities (sync helper)."""
     client = get_authenticated_client()
-    activities = client.get_club_activities(club_id, limit=limit)
+    activities = _sized_pages(client.get_club_activities(club_id, limit=limit))
 
-    results = []
-    for activity in activities:
-        activity_data = {
+    return [
+        {
             "name": activity.name,
             "type": activity.type,
             "distance": activity.distance,
@@ -1082,13 +1764,13 @@ def _fetch_club_activities(club_id: int, limit: int | None) -> list[dict[str, An
                 "lastname": activity.athlete.lastname if activity.athlete else None,
             },
         }
-        results.append(activity_data)
-
-    return results
+        for activity in activities
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("club_id", max_limit=200)
 async def get_club_activities(
     club_id: int,
     limit: int = 30,
@@ -1102,16 +1784,7 @@ async def get_club_activities(
     Returns:
         List of recent club activities with athlete info.
     """
-    if club_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "club_id must be a positive integer",
-        }
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)
-
-    activities = await asyncio.to_thread(_fetch_club_activities, club_id, limit)
+    activities = await _run_strava(_fetch_club_activities, club_id, limit)
 
     return {
         "club_id": club_id,
@@ -1130,11 +1803,10 @@ STRAVA_ATHLETE_WEB_URL = "https://www.strava.com/athletes"
 def _fetch_activity_kudos(activity_id: int, limit: int | None) -> list[dict[str, Any]]:
     """Fetch activity kudos (sync helper)."""
     client = get_authenticated_client()
-    kudoers = client.get_activity_kudos(activity_id, limit=limit)
+    kudoers = _sized_pages(client.get_activity_kudos(activity_id, limit=limit))
 
-    results = []
-    for athlete in kudoers:
-        kudoer_data = {
+    return [
+        {
             "id": athlete.id,
             "firstname": athlete.firstname,
             "lastname": athlete.lastname,
@@ -1143,13 +1815,13 @@ def _fetch_activity_kudos(activity_id: int, limit: int | None) -> list[dict[str,
                 "web": f"{STRAVA_ATHLETE_WEB_URL}/{athlete.id}",
             },
         }
-        results.append(kudoer_data)
-
-    return results
+        for athlete in kudoers
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("activity_id", max_limit=200)
 async def get_activity_kudos(
     activity_id: int,
     limit: int = 30,
@@ -1163,16 +1835,7 @@ async def get_activity_kudos(
     Returns:
         List of athletes who gave kudos with profile links.
     """
-    if activity_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "activity_id must be a positive integer",
-        }
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)
-
-    kudoers = await asyncio.to_thread(_fetch_activity_kudos, activity_id, limit)
+    kudoers = await _run_strava(_fetch_activity_kudos, activity_id, limit)
 
     return {
         "activity_id": activity_id,
@@ -1186,11 +1849,10 @@ def _fetch_activity_comments(
 ) -> list[dict[str, Any]]:
     """Fetch activity comments (sync helper)."""
     client = get_authenticated_client()
-    comments = client.get_activity_comments(activity_id, limit=limit)
+    comments = _sized_pages(client.get_activity_comments(activity_id, limit=limit))
 
-    results = []
-    for comment in comments:
-        comment_data = {
+    return [
+        {
             "id": comment.id,
             "text": comment.text,
             "created_at": _format_timestamp(comment.created_at),
@@ -1205,13 +1867,13 @@ def _fetch_activity_comments(
                 },
             },
         }
-        results.append(comment_data)
-
-    return results
+        for comment in comments
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args("activity_id", max_limit=200)
 async def get_activity_comments(
     activity_id: int,
     limit: int = 30,
@@ -1225,16 +1887,7 @@ async def get_activity_comments(
     Returns:
         List of comments with text, timestamps, and athlete info.
     """
-    if activity_id < 1:
-        return {
-            "error": "validation_error",
-            "message": "activity_id must be a positive integer",
-        }
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)
-
-    comments = await asyncio.to_thread(_fetch_activity_comments, activity_id, limit)
+    comments = await _run_strava(_fetch_activity_comments, activity_id, limit)
 
     return {
         "activity_id": activity_id,
@@ -1252,19 +1905,15 @@ def _fetch_athlete_koms(athlete_id: int | None, limit: int) -> list[dict[str, An
     """Fetch athlete KOMs/CRs (sync helper)."""
     client = get_authenticated_client()
 
-    # If no athlete_id provided, get the authenticated athlete's ID
-    resolved_athlete_id: int
-    if athlete_id is None:
-        athlete = client.get_athlete()
-        resolved_athlete_id = athlete.id  # type: ignore[assignment]
-    else:
-        resolved_athlete_id = athlete_id
+    # If no athlete_id provided, use the authenticated athlete's ID
+    resolved_athlete_id = (
+        _authenticated_athlete_id(client) if athlete_id is None else athlete_id
+    )
 
-    efforts = client.get_athlete_koms(resolved_athlete_id, limit=limit)
+    efforts = _sized_pages(client.get_athlete_koms(resolved_athlete_id, limit=limit))
 
-    results = []
-    for effort in efforts:
-        effort_data = {
+    return [
+        {
             "id": effort.id,
             "name": effort.name,
             "elapsed_time": effort.elapsed_time,
@@ -1287,13 +1936,13 @@ def _fetch_athlete_koms(athlete_id: int | None, limit: int) -> list[dict[str, An
                 "id": effort.activity.id if effort.activity else None,
             },
         }
-        results.append(effort_data)
-
-    return results
+        for effort in efforts
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args(max_limit=200)
 async def get_my_koms(
     limit: int = 30,
 ) -> dict[str, Any] | list[dict[str, Any]]:
@@ -1305,11 +1954,7 @@ async def get_my_koms(
     Returns:
         List of segment efforts where the athlete holds the KOM/CR.
     """
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)
-
-    koms = await asyncio.to_thread(_fetch_athlete_koms, None, limit)
+    koms = await _run_strava(_fetch_athlete_koms, None, limit)
 
     return {
         "count": len(koms),
@@ -1320,11 +1965,10 @@ async def get_my_koms(
 def _fetch_starred_segments(limit: int | None) -> list[dict[str, Any]]:
     """Fetch starred segments (sync helper)."""
     client = get_authenticated_client()
-    segments = client.get_starred_segments(limit=limit)
+    segments = _sized_pages(client.get_starred_segments(limit=limit))
 
-    results = []
-    for segment in segments:
-        segment_data = {
+    return [
+        {
             "id": segment.id,
             "name": segment.name,
             "activity_type": segment.activity_type,
@@ -1339,13 +1983,13 @@ def _fetch_starred_segments(limit: int | None) -> list[dict[str, Any]]:
                 "app": f"{STRAVA_SEGMENT_APP_URL}/{segment.id}",
             },
         }
-        results.append(segment_data)
-
-    return results
+        for segment in segments
+    ]
 
 
 @mcp.tool()
 @handle_strava_errors
+@validate_args(max_limit=200)
 async def get_starred_segments(
     limit: int = 30,
 ) -> dict[str, Any] | list[dict[str, Any]]:
@@ -1357,11 +2001,7 @@ async def get_starred_segments(
     Returns:
         List of starred segments with details and deeplinks.
     """
-    if limit < 1:
-        return {"error": "validation_error", "message": "limit must be at least 1"}
-    limit = min(limit, 200)
-
-    segments = await asyncio.to_thread(_fetch_starred_segments, limit)
+    segments = await _run_strava(_fetch_starred_segments, limit)
 
     return {
         "count": len(segments),
@@ -1369,15 +2009,32 @@ async def get_starred_segments(
     }
 
 
-def main() -> None:
-    """Main entry point for the MCP server."""
+async def _run() -> None:
+    """Run the OAuth server and the stdio MCP server on one event loop."""
     # Try to start OAuth server when MCP server loads (non-blocking on failure)
     try:
         start_oauth_server()
     except Exception:
         pass  # OAuth server is optional - manual auth still works
 
-    mcp.run(transport="stdio")
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await _oauth_manager.stop()
+
+
+def main() -> None:
+    """Main entry point for the MCP server.
+
+    Runs on uvloop when it is installed (uvicorn[standard] ships it everywhere
+    except Windows and PyPy), falling back to the default asyncio loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(_run())
+    else:
+        uvloop.run(_run())
 
 
 if __name__ == "__main__":
@@ -3,17 +3,27 @@
 Stores tokens in memory only. Tokens are lost when the MCP server restarts,
 requiring re-authentication each Claude Desktop session.
 
-Thread-safe: All operations are protected by a lock since the OAuth server
-runs in a separate thread from the MCP server.
+Thread-safe: Writes are serialized by a lock since the MCP tools' blocking
+Strava calls (including token refresh) run in worker threads. Reads need no
+lock: the stored tokens are an immutable snapshot that is replaced, never
+modified.
 """
 
 from __future__ import annotations
 
+import functools
 import os
 import threading
-from datetime import datetime
+import time
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 from typing import Any, TypedDict
 
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 
 class TokenDict(TypedDict):
     """Type-safe dictionary for Strava OAuth tokens."""
@@ -23,16 +33,26 @@ class TokenDict(TypedDict):
     expires_at: float
 
 
-# Thread-safe in-memory token storage
-_tokens: TokenDict | None = None
+# Thread-safe in-memory token storage: a read-only snapshot, swapped on save.
+# Readers rely on the reference assignment being atomic (true under the GIL;
+# a free-threaded build would need an atomic reference here).
+_tokens: MappingProxyType[str, Any] | None = None
 _lock = threading.Lock()
 
+# Callbacks run after tokens are saved or deleted (login, refresh, logout)
+_listeners: list[Callable[[], None]] = []
+
 
 # =============================================================================
 # Shared Configuration Functions
 # =============================================================================
 
+# Credentials are read from the environment once per process. Call
+# clear_credentials_cache() after changing STRAVA_CLIENT_ID/SECRET at runtime;
+# load_env() does this for .env reloads.
+
 
+@functools.cache
 def get_client_id() -> int:
     """Get Strava client ID from environment, converting to int."""
     client_id = os.environ.get("STRAVA_CLIENT_ID")
@@ -41,6 +61,7 @@ def get_client_id() -> int:
     return int(client_id)
 
 
+@functools.cache
 def get_client_secret() -> str:
     """Get Strava client secret from environment."""
     client_secret = os.environ.get("STRAVA_CLIENT_SECRET")
@@ -49,6 +70,7 @@ def get_client_secret() -> str:
     return client_secret
 
 
+@functools.cache
 def has_credentials() -> bool:
     """Check if Strava credentials are configured."""
     return bool(
@@ -56,6 +78,19 @@ def has_credentials() -> bool:
     )
 
 
+def clear_credentials_cache() -> None:
+    """Forget cached credentials so the next lookup re-reads the environment."""
+    get_client_id.cache_clear()
+    get_client_secret.cache_clear()
+    has_credentials.cache_clear()
+
+
+def load_env() -> None:
+    """Load .env into the environment and drop any stale cached credentials."""
+    load_dotenv(override=True)
+    clear_credentials_cache()
+
+
 def token_response_to_dict(token_response: Any) -> TokenDict:
     """Convert stravalib token response to a dictionary for storage."""
     return {
@@ -65,20 +100,56 @@ def token_response_to_dict(token_response: Any) -> TokenDict:
     }
 
 
+@functools.cache
+def get_http_session() -> requests.Session:
+    """Return the process-wide HTTP session shared by all Strava clients.
+
+    Pooled keep-alive connections mean only the first request pays for the
+    TLS handshake. Transient 5xx responses to idempotent requests are retried
+    with backoff. POSTs (code exchange, token refresh) never are, since an
+    authorization code is single-use.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,  # Let stravalib map the final response to an error
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
 # =============================================================================
 # Token Storage Functions
 # =============================================================================
 
 
-def load_tokens() -> TokenDict | None:
-    """Load tokens from memory (thread-safe).
+def on_tokens_changed(callback: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback to run whenever tokens are saved or deleted.
+
+    Returns the callback unchanged, so this can be used as a decorator. Used to
+    drop state derived from the current tokens, such as cached responses.
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def _notify_listeners() -> None:
+    """Run token-change callbacks (outside the lock, so they may read tokens)."""
+    for callback in _listeners:
+        callback()
+
+
+def load_tokens() -> Mapping[str, Any] | None:
+    """Load tokens from memory (thread-safe, lock-free).
 
     Returns:
-        A copy of the token dictionary, or None if not set.
-        Returns a copy to prevent external mutation of internal state.
+        A read-only view of the stored tokens, or None if not set.
+        The view is never modified; save_tokens replaces it instead.
     """
-    with _lock:
-        return dict(_tokens) if _tokens else None  # type: ignore[return-value]
+    return _tokens
 
 
 def save_tokens(tokens: TokenDict) -> None:
@@ -89,7 +160,8 @@ def save_tokens(tokens: TokenDict) -> None:
     """
     global _tokens
     with _lock:
-        _tokens = dict(tokens)  # type: ignore[assignment]
+        _tokens = MappingProxyType(dict(tokens))
+    _notify_listeners()
 
 
 def delete_tokens() -> None:
@@ -97,9 +169,10 @@ def delete_tokens() -> None:
     global _tokens
     with _lock:
         _tokens = None
+    _notify_listeners()
 
 
-def is_token_expired(tokens: TokenDict) -> bool:
+def is_token_expired(tokens: Mapping[str, Any]) -> bool:
     """Check if the access token is expired.
 
     Args:
@@ -108,4 +181,4 @@ def is_token_expired(tokens: TokenDict) -> bool:
     Returns:
         True if token is expired, False otherwise.
     """
-    return tokens["expires_at"] < datetime.now().timestamp()
+    return tokens["expires_at"] < time.time()
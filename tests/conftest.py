@@ -1,291 +1,424 @@
 """Pytest fixtures for strava-mcp tests."""
 
+import asyncio
+import copy
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
-
-from strava_mcp import tokens
+from stravalib.model import LatLon
+
+from strava_mcp import oauth, server, tokens
+
+# Token expiry times, fixed at import: a test session is far shorter than
+# the six hours the "valid" tokens stay fresh for.
+_NOW = datetime.now()
+_FUTURE_TS = (_NOW + timedelta(hours=6)).timestamp()
+_PAST_TS = (_NOW - timedelta(hours=1)).timestamp()
+
+# Payloads returned by the mocks' model_dump(). Each call returns a fresh
+# copy, like pydantic does, so tests may mutate the results freely.
+ATHLETE_DICT = {
+    "id": 12345678,
+    "firstname": "Test",
+    "lastname": "User",
+    "city": "San Francisco",
+    "state": "CA",
+    "country": "United States",
+    "sex": "M",
+    "premium": True,
+}
+
+ACTIVITY_DICT = {
+    "id": 9876543210,
+    "name": "Morning Run",
+    "type": "Run",
+    "distance": 5000.0,
+    "moving_time": 1800,
+    "elapsed_time": 1850,
+    "total_elevation_gain": 50.0,
+    "start_date": "2025-12-28T07:00:00Z",
+    "average_speed": 2.78,
+    "max_speed": 3.5,
+}
+
+ATHLETE_STATS_DICT = {
+    "recent_run_totals": {
+        "count": 10,
+        "distance": 50000.0,
+        "moving_time": 18000,
+        "elevation_gain": 500.0,
+    },
+    "ytd_run_totals": {
+        "count": 150,
+        "distance": 750000.0,
+        "moving_time": 270000,
+        "elevation_gain": 7500.0,
+    },
+    "all_run_totals": {
+        "count": 500,
+        "distance": 2500000.0,
+        "moving_time": 900000,
+        "elevation_gain": 25000.0,
+    },
+}
 
 
 @pytest.fixture(autouse=True)
 def reset_tokens():
-    """Reset in-memory tokens before each test."""
-    tokens._tokens = None
+    """Clear in-memory tokens after each test.
+
+    Nothing stores tokens outside a test, so clearing them on teardown is
+    enough for every test to start logged out.
+    """
     yield
     tokens._tokens = None
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Clear process-level caches so patched env vars and clients apply."""
+    tokens.clear_credentials_cache()
+    oauth._get_unauthenticated_client.cache_clear()
+    server._get_unauthenticated_client.cache_clear()
+    server._auth_url_without_state.cache_clear()
+    server._nominatim_throttle = server._Throttle(min_interval=1.0)
+    server._geocode_cache.clear()
+    server._clear_response_caches()
+    server._forget_authenticated_client()
+    server._rate_limits._blocked_until = 0.0
+    server._refresh_lock = asyncio.Lock()
+    server._strava_semaphore = asyncio.Semaphore(server.STRAVA_MAX_CONCURRENCY)
+    yield
+
+
+# The token fixtures are shared by the whole session, so they are read-only;
+# a test that needs to change them copies them first.
+
+
+@pytest.fixture(scope="session")
 def valid_tokens():
     """Return valid (non-expired) tokens."""
-    return {
-        "access_token": "test_access_token_12345",
-        "refresh_token": "test_refresh_token_67890",
-        "expires_at": (datetime.now() + timedelta(hours=6)).timestamp(),
-        "token_type": "Bearer",
-    }
+    return MappingProxyType(
+        {
+            "access_token": "test_access_token_12345",
+            "refresh_token": "test_refresh_token_67890",
+            "expires_at": _FUTURE_TS,
+            "token_type": "Bearer",
+        }
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def expired_tokens():
     """Return expired tokens."""
-    return {
-        "access_token": "expired_access_token",
-        "refresh_token": "test_refresh_token_67890",
-        "expires_at": (datetime.now() - timedelta(hours=1)).timestamp(),
-        "token_type": "Bearer",
-    }
+    return MappingProxyType(
+        {
+            "access_token": "expired_access_token",
+            "refresh_token": "test_refresh_token_67890",
+            "expires_at": _PAST_TS,
+            "token_type": "Bearer",
+        }
+    )
 
 
-@pytest.fixture
+# The athlete, activity and stats stand-ins are frozen, so one instance can
+# serve the whole session. The rest are plain namespaces: the code under
+# test only reads their attributes, so MagicMock's call recording isn't
+# needed. Those are built once per session and deep-copied into each test.
+
+
+@dataclass(frozen=True, slots=True)
+class FakeAthlete:
+    """Read-only stand-in for a stravalib athlete."""
+
+    id: int = 12345678
+    firstname: str = "Test"
+    lastname: str = "User"
+    city: str = "San Francisco"
+    state: str = "CA"
+    country: str = "United States"
+    sex: str = "M"
+    premium: bool = True
+    created_at: datetime = datetime(2020, 1, 1)
+    updated_at: datetime = datetime(2025, 1, 1)
+
+    def model_dump(self, **kwargs):
+        return copy.deepcopy(ATHLETE_DICT)
+
+
+@dataclass(frozen=True, slots=True)
+class FakeActivity:
+    """Read-only stand-in for a stravalib activity."""
+
+    id: int = 9876543210
+    name: str = "Morning Run"
+    type: str = "Run"
+    distance: float = 5000.0  # meters
+    moving_time: int = 1800  # seconds
+    elapsed_time: int = 1850
+    total_elevation_gain: float = 50.0
+    start_date: datetime = datetime(2025, 12, 28, 7, 0, 0)
+    start_date_local: datetime = datetime(2025, 12, 28, 7, 0, 0)
+    average_speed: float = 2.78  # m/s
+    max_speed: float = 3.5
+    average_heartrate: int = 145
+    max_heartrate: int = 165
+
+    def model_dump(self, **kwargs):
+        return copy.deepcopy(ACTIVITY_DICT)
+
+
+@dataclass(frozen=True, slots=True)
+class FakeAthleteStats:
+    """Read-only stand-in for stravalib athlete statistics."""
+
+    def model_dump(self, **kwargs):
+        return copy.deepcopy(ATHLETE_STATS_DICT)
+
+
+@pytest.fixture(scope="session")
 def mock_athlete():
     """Return a mock Strava athlete."""
-    athlete = MagicMock()
-    athlete.id = 12345678
-    athlete.firstname = "Test"
-    athlete.lastname = "User"
-    athlete.city = "San Francisco"
-    athlete.state = "CA"
-    athlete.country = "United States"
-    athlete.sex = "M"
-    athlete.premium = True
-    athlete.created_at = datetime(2020, 1, 1)
-    athlete.updated_at = datetime(2025, 1, 1)
-    athlete.model_dump = MagicMock(
-        return_value={
-            "id": 12345678,
-            "firstname": "Test",
-            "lastname": "User",
-            "city": "San Francisco",
-            "state": "CA",
-            "country": "United States",
-            "sex": "M",
-            "premium": True,
-        }
-    )
-    return athlete
+    return FakeAthlete()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_activity():
     """Return a mock Strava activity."""
-    activity = MagicMock()
-    activity.id = 9876543210
-    activity.name = "Morning Run"
-    activity.type = "Run"
-    activity.distance = 5000.0  # meters
-    activity.moving_time = 1800  # seconds
-    activity.elapsed_time = 1850
-    activity.total_elevation_gain = 50.0
-    activity.start_date = datetime(2025, 12, 28, 7, 0, 0)
-    activity.start_date_local = datetime(2025, 12, 28, 7, 0, 0)
-    activity.average_speed = 2.78  # m/s
-    activity.max_speed = 3.5
-    activity.average_heartrate = 145
-    activity.max_heartrate = 165
-    activity.model_dump = MagicMock(
-        return_value={
-            "id": 9876543210,
-            "name": "Morning Run",
-            "type": "Run",
-            "distance": 5000.0,
-            "moving_time": 1800,
-            "elapsed_time": 1850,
-            "total_elevation_gain": 50.0,
-            "start_date": "2025-12-28T07:00:00Z",
-            "average_speed": 2.78,
-            "max_speed": 3.5,
-        }
-    )
-    return activity
+    return FakeActivity()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_athlete_stats():
     """Return mock athlete statistics."""
-    stats = MagicMock()
-    stats.model_dump = MagicMock(
-        return_value={
-            "recent_run_totals": {
-                "count": 10,
-                "distance": 50000.0,
-                "moving_time": 18000,
-                "elevation_gain": 500.0,
-            },
-            "ytd_run_totals": {
-                "count": 150,
-                "distance": 750000.0,
-                "moving_time": 270000,
-                "elevation_gain": 7500.0,
-            },
-            "all_run_totals": {
-                "count": 500,
-                "distance": 2500000.0,
-                "moving_time": 900000,
-                "elevation_gain": 25000.0,
-            },
-        }
-    )
-    return stats
+    return FakeAthleteStats()
 
 
-@pytest.fixture
-def mock_strava_client(
-    mock_athlete,
-    mock_activity,
-    mock_athlete_stats,
-    mock_segment,
-    mock_segment_explorer_result,
-    mock_route,
-):
-    """Return a fully mocked Strava client."""
-    with patch("strava_mcp.server.Client") as mock_client:
-        client_instance = MagicMock()
+@contextmanager
+def _patch_client(target, mocks, **return_values):
+    """Patch ``target`` with reusable Client mocks, reset and rewired.
 
-        # Mock get_athlete
-        client_instance.get_athlete.return_value = mock_athlete
+    Args:
+        target: Dotted path of the Client class to replace.
+        mocks: The (class, instance) mock pair to reuse.
+        **return_values: Return values for the instance's methods, by name.
 
-        # Mock get_activities - returns an iterator
-        client_instance.get_activities.return_value = iter([mock_activity])
+    Yields:
+        The Client class mock.
+    """
+    mock_client, client_instance = mocks
+    mock_client.reset_mock(return_value=True, side_effect=True)
+    client_instance.reset_mock(return_value=True, side_effect=True)
+    for name, value in return_values.items():
+        getattr(client_instance, name).return_value = value
 
-        # Mock get_activity
-        client_instance.get_activity.return_value = mock_activity
+    # Return mock instance when Client() is called
+    mock_client.return_value = client_instance
 
-        # Mock get_athlete_stats
-        client_instance.get_athlete_stats.return_value = mock_athlete_stats
+    with patch(target, new=mock_client):
+        yield mock_client
 
-        # Mock explore_segments
-        client_instance.explore_segments.return_value = [mock_segment_explorer_result]
 
-        # Mock get_segment
-        client_instance.get_segment.return_value = mock_segment
+@pytest.fixture(scope="session")
+def _strava_client_mocks():
+    """Create the server's Client class and instance mocks once per session."""
+    return MagicMock(), MagicMock()
 
-        # Mock get_routes - returns an iterator
-        client_instance.get_routes.return_value = iter([mock_route])
 
-        # Mock get_route
-        client_instance.get_route.return_value = mock_route
+@pytest.fixture(scope="session")
+def _oauth_client_mocks():
+    """Create the OAuth app's Client class and instance mocks once per session."""
+    return MagicMock(), MagicMock()
 
-        # Mock update_activity
-        updated_activity = MagicMock()
-        updated_activity.id = 9876543210
-        updated_activity.name = "Morning Run"
-        updated_activity.description = "Updated notes"
-        client_instance.update_activity.return_value = updated_activity
 
-        # Mock token refresh
-        client_instance.refresh_access_token.return_value = {
+@pytest.fixture
+def mock_strava_client(
+    _strava_client_mocks,
+    mock_athlete,
+    mock_activity,
+    mock_athlete_stats,
+    mock_segment,
+    mock_segment_explorer_result,
+    mock_route,
+):
+    """Return a fully mocked Strava client.
+
+    The mocks are reused across tests: they are reset and rewired here, and
+    only patched in for the duration of the test.
+    """
+    with _patch_client(
+        "strava_mcp.server.Client",
+        _strava_client_mocks,
+        get_athlete=mock_athlete,
+        get_activity=mock_activity,
+        get_athlete_stats=mock_athlete_stats,
+        explore_segments=[mock_segment_explorer_result],
+        get_segment=mock_segment,
+        get_route=mock_route,
+        update_activity=SimpleNamespace(
+            id=9876543210, name="Morning Run", description="Updated notes"
+        ),
+        refresh_access_token={
             "access_token": "refreshed_token",
             "refresh_token": "new_refresh_token",
-            "expires_at": (datetime.now() + timedelta(hours=6)).timestamp(),
-        }
-
-        # Mock authorization URL
-        client_instance.authorization_url.return_value = (
+            "expires_at": _FUTURE_TS,
+        },
+        authorization_url=(
             "https://www.strava.com/oauth/authorize?client_id=123&redirect_uri=..."
-        )
-
-        # Mock token exchange
-        client_instance.exchange_code_for_token.return_value = {
+        ),
+        exchange_code_for_token={
             "access_token": "new_access_token",
             "refresh_token": "new_refresh_token",
-            "expires_at": (datetime.now() + timedelta(hours=6)).timestamp(),
-        }
+            "expires_at": _FUTURE_TS,
+        },
+    ) as mock_client:
+        client_instance = mock_client.return_value
 
-        # Return mock instance when Client() is called
-        mock_client.return_value = client_instance
+        # Mock list calls - return a fresh iterator on every call
+        activities = (mock_activity,)
+        client_instance.get_activities.side_effect = lambda *a, **kw: iter(activities)
+        routes = (mock_route,)
+        client_instance.get_routes.side_effect = lambda *a, **kw: iter(routes)
+
+        # Mock raw activity list JSON fetched through the protocol layer. The
+        # payload is flat, so a shallow copy keeps tests from sharing it.
+        client_instance.protocol.get.return_value = [dict(ACTIVITY_DICT)]
 
         yield mock_client
 
 
 @pytest.fixture
-def mock_env_vars():
-    """Set up environment variables for tests."""
-    with patch.dict(
-        "os.environ",
-        {
-            "STRAVA_CLIENT_ID": "12345",
-            "STRAVA_CLIENT_SECRET": "test_client_secret",
+def mock_oauth_client(_oauth_client_mocks, mock_athlete):
+    """Return a mocked Strava client for the OAuth app."""
+    with _patch_client(
+        "strava_mcp.oauth.Client",
+        _oauth_client_mocks,
+        authorization_url="https://www.strava.com/oauth/authorize?client_id=test",
+        exchange_code_for_token={
+            "access_token": "new_access_token",
+            "refresh_token": "new_refresh_token",
+            "expires_at": _FUTURE_TS,
         },
-    ):
+        get_athlete=mock_athlete,
+    ) as mock_client:
+        yield mock_client
+
+
+@pytest.fixture(scope="session")
+def mock_env_vars():
+    """Set the Strava client credentials once for the rest of the session.
+
+    Tests that need them missing override the variables with monkeypatch.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("STRAVA_CLIENT_ID", "12345")
+        mp.setenv("STRAVA_CLIENT_SECRET", "test_client_secret")
         yield
 
 
+@pytest.fixture(scope="session")
+def _segment_template():
+    """Build the mock Strava segment once."""
+    return SimpleNamespace(
+        id=12345,
+        name="Test Hill Climb",
+        activity_type="Run",
+        distance=1500.0,
+        average_grade=4.5,
+        maximum_grade=12.0,
+        elevation_high=150.0,
+        elevation_low=100.0,
+        total_elevation_gain=50.0,
+        climb_category=3,
+        city="San Francisco",
+        state="CA",
+        country="United States",
+        start_latlng=LatLon([37.7749, -122.4194]),
+        end_latlng=LatLon([37.7850, -122.4094]),
+        effort_count=5000,
+        athlete_count=1500,
+        star_count=250,
+        map=SimpleNamespace(polyline="encoded_polyline_string"),
+    )
+
+
 @pytest.fixture
-def mock_segment():
+def mock_segment(_segment_template):
     """Return a mock Strava segment."""
-    segment = MagicMock()
-    segment.id = 12345
-    segment.name = "Test Hill Climb"
-    segment.activity_type = "Run"
-    segment.distance = 1500.0
-    segment.average_grade = 4.5
-    segment.maximum_grade = 12.0
-    segment.elevation_high = 150.0
-    segment.elevation_low = 100.0
-    segment.total_elevation_gain = 50.0
-    segment.climb_category = 3
-    segment.city = "San Francisco"
-    segment.state = "CA"
-    segment.country = "United States"
-    segment.start_latlng = [37.7749, -122.4194]
-    segment.end_latlng = [37.7850, -122.4094]
-    segment.effort_count = 5000
-    segment.athlete_count = 1500
-    segment.star_count = 250
-    segment.map = MagicMock()
-    segment.map.polyline = "encoded_polyline_string"
-    return segment
+    return copy.deepcopy(_segment_template)
+
+
+@pytest.fixture(scope="session")
+def _segment_explorer_result_template():
+    """Build the mock segment explorer result once."""
+    return SimpleNamespace(
+        id=12345,
+        name="Test Hill Climb",
+        climb_category=3,
+        avg_grade=4.5,
+        start_latlng=LatLon([37.7749, -122.4194]),
+        end_latlng=LatLon([37.7850, -122.4094]),
+        elev_difference=50.0,
+        distance=1500.0,
+    )
 
 
 @pytest.fixture
-def mock_segment_explorer_result():
+def mock_segment_explorer_result(_segment_explorer_result_template):
     """Return a mock segment explorer result."""
-    result = MagicMock()
-    result.id = 12345
-    result.name = "Test Hill Climb"
-    result.climb_category = 3
-    result.avg_grade = 4.5
-    result.start_latlng = [37.7749, -122.4194]
-    result.end_latlng = [37.7850, -122.4094]
-    result.elev_difference = 50.0
-    result.distance = 1500.0
-    return result
+    return copy.deepcopy(_segment_explorer_result_template)
+
+
+@pytest.fixture(scope="session")
+def _route_template():
+    """Build the mock Strava route once."""
+    return SimpleNamespace(
+        id=98765,
+        name="Morning Loop",
+        description="A nice morning run route",
+        distance=8000.0,
+        elevation_gain=150.0,
+        type=1,  # Run
+        sub_type=1,
+        starred=False,
+        private=False,
+        timestamp=datetime(2025, 1, 1, 10, 0, 0),
+        map=SimpleNamespace(
+            polyline="route_polyline_string",
+            summary_polyline="route_summary_polyline",
+        ),
+        segments=[],
+    )
 
 
 @pytest.fixture
-def mock_route():
+def mock_route(_route_template):
     """Return a mock Strava route."""
-    route = MagicMock()
-    route.id = 98765
-    route.name = "Morning Loop"
-    route.description = "A nice morning run route"
-    route.distance = 8000.0
-    route.elevation_gain = 150.0
-    route.type = 1  # Run
-    route.sub_type = 1
-    route.starred = False
-    route.private = False
-    route.timestamp = datetime(2025, 1, 1, 10, 0, 0)
-    route.map = MagicMock()
-    route.map.polyline = "route_polyline_string"
-    route.map.summary_polyline = "route_summary_polyline"
-    route.segments = []
-    return route
+    return copy.deepcopy(_route_template)
+
+
+@pytest.fixture
+def stub_oauth_server(monkeypatch):
+    """Stop get_auth_url from starting the real OAuth callback server."""
+    monkeypatch.setattr(server, "start_oauth_server", lambda *args, **kwargs: True)
+
+
+@pytest.fixture(scope="session")
+def _geocoder_mock():
+    """Create the geocoder mock once per session."""
+    return MagicMock()
 
 
 @pytest.fixture
-def mock_geocoder():
-    """Return a mock geocoder."""
-    with patch("strava_mcp.server.Nominatim") as mock_nom:
-        mock_location = MagicMock()
-        mock_location.latitude = 37.7749
-        mock_location.longitude = -122.4194
-        mock_location.address = "San Francisco, CA, USA"
-
-        mock_geolocator = MagicMock()
-        mock_geolocator.geocode.return_value = mock_location
-
-        mock_nom.return_value = mock_geolocator
-        yield mock_geolocator
+def mock_geocoder(_geocoder_mock):
+    """Return a mock geocoder that resolves every query to San Francisco."""
+    _geocoder_mock.reset_mock(return_value=True, side_effect=True)
+    _geocoder_mock.geocode.return_value = SimpleNamespace(
+        latitude=37.7749, longitude=-122.4194, address="San Francisco, CA, USA"
+    )
+    with patch("strava_mcp.server._geocoder", new=_geocoder_mock):
+        yield _geocoder_mock
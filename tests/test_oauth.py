@@ -1,156 +1,146 @@
 """Tests for OAuth callback server."""
 
-from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from fastapi import Request
 from httpx import ASGITransport, AsyncClient
 
-from strava_mcp import tokens
-from strava_mcp.oauth import generate_oauth_state
+from strava_mcp import oauth, tokens
+from strava_mcp.oauth import (
+    app,
+    generate_oauth_state,
+    logged_in,
+    validate_oauth_state,
+)
+from strava_mcp.server import OAuthServerManager
 
 
-@pytest.fixture
-def mock_oauth_env():
-    """Set up environment variables for OAuth tests."""
-    with patch.dict(
-        "os.environ",
+def _request(path: str) -> Request:
+    """Build a bare GET request for calling an endpoint without routing."""
+    return Request(
         {
-            "STRAVA_CLIENT_ID": "12345",
-            "STRAVA_CLIENT_SECRET": "test_client_secret",
-        },
-    ):
-        yield
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        }
+    )
 
 
 @pytest.fixture
-def mock_oauth_client(mock_athlete):
-    """Mock Strava client for OAuth tests."""
-    with patch("strava_mcp.oauth.Client") as mock_client:
-        client_instance = MagicMock()
-
-        # Mock authorization_url
-        client_instance.authorization_url.return_value = (
-            "https://www.strava.com/oauth/authorize?client_id=test"
-        )
+async def http_client():
+    """Return an HTTP client wired straight to the OAuth app (no network)."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
 
-        # Mock token exchange
-        client_instance.exchange_code_for_token.return_value = {
-            "access_token": "new_access_token",
-            "refresh_token": "new_refresh_token",
-            "expires_at": (datetime.now() + timedelta(hours=6)).timestamp(),
-        }
 
-        # Mock get_athlete
-        client_instance.get_athlete.return_value = mock_athlete
+class TestOAuthState:
+    """Tests for CSRF state generation and validation."""
 
-        mock_client.return_value = client_instance
-        yield mock_client
+    def test_valid_state_is_accepted_once(self):
+        """Should accept a freshly generated state exactly once."""
+        state = generate_oauth_state()
 
+        assert validate_oauth_state(state) is True
+        assert validate_oauth_state(state) is False
 
-class TestLoginEndpoint:
-    """Tests for the / login endpoint."""
+    def test_unknown_state_is_rejected(self):
+        """Should reject a state that was never generated."""
+        assert validate_oauth_state("not-a-real-state") is False
+        assert validate_oauth_state(None) is False
 
-    @pytest.mark.asyncio
-    async def test_login_page_renders(self, mock_oauth_env, mock_oauth_client):
-        """Should render login page with authorization URL."""
-        from strava_mcp.oauth import app
+    def test_expired_state_is_rejected(self):
+        """Should reject a state older than the TTL."""
+        state = generate_oauth_state()
+        oauth._pending_states[state] -= oauth.STATE_TTL_SECONDS + 1
 
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get("/")
+        assert validate_oauth_state(state) is False
+        assert state not in oauth._pending_states
 
-        assert response.status_code == 200
-        assert "strava" in response.text.lower()
+    def test_generate_sweeps_expired_states(self):
+        """Should drop expired states when generating a new one."""
+        stale = generate_oauth_state()
+        later = time.time() + oauth.STATE_TTL_SECONDS + 1
 
-    @pytest.mark.asyncio
-    async def test_login_shows_error_without_credentials(self):
-        """Should show error when credentials are missing."""
-        # Clear env vars to simulate missing credentials
-        with patch.dict(
-            "os.environ",
-            {"STRAVA_CLIENT_ID": "", "STRAVA_CLIENT_SECRET": ""},
-            clear=False,
-        ):
-            from strava_mcp.oauth import app
+        with patch("strava_mcp.oauth.time.time", return_value=later):
+            fresh = generate_oauth_state()
 
-            async with AsyncClient(
-                transport=ASGITransport(app=app), base_url="http://test"
-            ) as client:
-                response = await client.get("/")
+        assert stale not in oauth._pending_states
+        assert fresh in oauth._pending_states
 
-            assert response.status_code == 200
-            assert "not configured" in response.text.lower()
 
+class TestLoginEndpoint:
+    """Tests for the / login endpoint."""
 
-class TestOAuthCallback:
-    """Tests for the /strava-oauth callback endpoint."""
-
-    @pytest.mark.asyncio
-    async def test_callback_with_error_shows_error_page(
-        self, mock_oauth_env, mock_oauth_client
+    async def test_login_page_renders(
+        self, http_client, mock_env_vars, mock_oauth_client
     ):
-        """Should show error page when Strava returns an error."""
-        from strava_mcp.oauth import app
-
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get("/strava-oauth?error=access_denied")
+        """Should render login page with authorization URL."""
+        response = await http_client.get("/")
 
         assert response.status_code == 200
-        assert "access_denied" in response.text
+        assert "strava" in response.text.lower()
 
-    @pytest.mark.asyncio
-    async def test_callback_without_code_shows_error(
-        self, mock_oauth_env, mock_oauth_client
+    async def test_login_shows_error_without_credentials(
+        self, http_client, monkeypatch
     ):
-        """Should show error when code is missing but state is valid."""
-        from strava_mcp.oauth import app
-
-        # Generate a valid state first
-        state = generate_oauth_state()
+        """Should show error when credentials are missing."""
+        # Clear env vars to simulate missing credentials
+        monkeypatch.setenv("STRAVA_CLIENT_ID", "")
+        monkeypatch.setenv("STRAVA_CLIENT_SECRET", "")
 
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get(f"/strava-oauth?state={state}")
+        response = await http_client.get("/")
 
         assert response.status_code == 200
-        assert "missing" in response.text.lower()
+        assert "not configured" in response.text.lower()
 
-    @pytest.mark.asyncio
-    async def test_callback_without_state_shows_csrf_error(
-        self, mock_oauth_env, mock_oauth_client
+
+class TestOAuthCallback:
+    """Tests for the /strava-oauth callback endpoint."""
+
+    @pytest.mark.parametrize(
+        "params,with_state,expected",
+        [
+            pytest.param(
+                {"error": "access_denied"}, False, "access_denied", id="strava-error"
+            ),
+            pytest.param({}, True, "Missing authorization code", id="missing-code"),
+            pytest.param(
+                {"code": "test_auth_code"},
+                False,
+                "Invalid or expired OAuth state",
+                id="missing-state",
+            ),
+            pytest.param({"code": "test_auth_code"}, True, "Test", id="success"),
+        ],
+    )
+    async def test_callback_renders_page(
+        self, mock_env_vars, mock_oauth_client, params, with_state, expected
     ):
-        """Should show CSRF error when state is missing."""
-        from strava_mcp.oauth import app
+        """Should render the error or success page matching the callback query."""
+        if with_state:
+            params = {**params, "state": generate_oauth_state()}
 
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get("/strava-oauth?code=test_auth_code")
+        response = await logged_in(_request("/strava-oauth"), **params)
 
         assert response.status_code == 200
-        assert "csrf" in response.text.lower() or "state" in response.text.lower()
+        assert expected in bytes(response.body).decode()
 
-    @pytest.mark.asyncio
     async def test_callback_exchanges_code_for_tokens(
-        self, mock_oauth_env, mock_oauth_client
+        self, http_client, mock_env_vars, mock_oauth_client
     ):
         """Should exchange code for tokens and save them."""
-        from strava_mcp.oauth import app
-
         # Generate a valid state first
         state = generate_oauth_state()
 
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get(
-                f"/strava-oauth?code=test_auth_code&state={state}"
-            )
+        response = await http_client.get(
+            f"/strava-oauth?code=test_auth_code&state={state}"
+        )
 
         assert response.status_code == 200
 
@@ -161,22 +151,16 @@ class TestOAuthCallback:
         )
         assert call_kwargs["code"] == "test_auth_code"
 
-    @pytest.mark.asyncio
     async def test_callback_saves_tokens_to_memory(
-        self, mock_oauth_env, mock_oauth_client
+        self, http_client, mock_env_vars, mock_oauth_client
     ):
         """Should save tokens to memory after successful auth."""
-        from strava_mcp.oauth import app
-
         # Generate a valid state first
         state = generate_oauth_state()
 
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get(
-                f"/strava-oauth?code=test_auth_code&state={state}"
-            )
+        response = await http_client.get(
+            f"/strava-oauth?code=test_auth_code&state={state}"
+        )
 
         assert response.status_code == 200
 
@@ -185,38 +169,53 @@ class TestOAuthCallback:
         assert saved is not None
         assert saved["access_token"] == "new_access_token"
 
-    @pytest.mark.asyncio
-    async def test_callback_shows_success_page(self, mock_oauth_env, mock_oauth_client):
-        """Should show success page with athlete info."""
-        from strava_mcp.oauth import app
-
-        # Generate a valid state first
-        state = generate_oauth_state()
-
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get(
-                f"/strava-oauth?code=test_auth_code&state={state}"
-            )
-
-        assert response.status_code == 200
-        # Should contain athlete name
-        assert "Test" in response.text
-
 
 class TestStaticFiles:
     """Tests for static file serving."""
 
-    @pytest.mark.asyncio
-    async def test_static_files_are_served(self, mock_oauth_env):
+    async def test_static_files_are_served(self, http_client, mock_env_vars):
         """Should serve static files."""
-        from strava_mcp.oauth import app
-
-        async with AsyncClient(
-            transport=ASGITransport(app=app), base_url="http://test"
-        ) as client:
-            response = await client.get("/static/ConnectWithStrava.png")
+        response = await http_client.get("/static/ConnectWithStrava.png")
 
         # Should either succeed or return 404 (not a server error)
         assert response.status_code in [200, 404]
+
+
+class TestOAuthServerManager:
+    """Tests for running the OAuth server on the MCP event loop."""
+
+    async def test_start_runs_server_as_task_once(self):
+        """Should start one server task and reuse it while it is running."""
+        manager = OAuthServerManager()
+        with patch("strava_mcp.server.uvicorn.Server") as mock_server:
+            mock_server.return_value.serve = AsyncMock()
+
+            assert manager.start() is True
+            assert manager.start() is True
+            await manager._task
+
+        mock_server.assert_called_once()
+        mock_server.return_value.serve.assert_awaited_once()
+
+    async def test_bind_failure_does_not_exit_process(self):
+        """Should contain uvicorn's SystemExit when the port is unavailable."""
+        manager = OAuthServerManager()
+        with patch("strava_mcp.server.uvicorn.Server") as mock_server:
+            mock_server.return_value.serve = AsyncMock(side_effect=SystemExit(1))
+
+            assert manager.start() is True
+            await manager._task
+
+        assert manager._task.done()
+
+    async def test_stop_signals_server_and_waits(self):
+        """Should set should_exit and wait for the server task to finish."""
+        manager = OAuthServerManager()
+        with patch("strava_mcp.server.uvicorn.Server") as mock_server:
+            mock_server.return_value.serve = AsyncMock()
+            manager.start()
+
+            await manager.stop()
+
+        assert mock_server.return_value.should_exit is True
+        assert manager._task.done()
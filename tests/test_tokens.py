@@ -1,25 +1,25 @@
 """Tests for token management."""
 
-from datetime import datetime, timedelta
+import time
+from unittest.mock import patch
 
 import pytest
 
 from strava_mcp.tokens import (
+    clear_credentials_cache,
     delete_tokens,
+    get_client_id,
+    get_http_session,
+    has_credentials,
     is_token_expired,
+    load_env,
     load_tokens,
+    on_tokens_changed,
     save_tokens,
 )
 
-
-@pytest.fixture
-def valid_tokens():
-    """Return valid (non-expired) tokens."""
-    return {
-        "access_token": "test_access_token_12345",
-        "refresh_token": "test_refresh_token_67890",
-        "expires_at": (datetime.now() + timedelta(hours=6)).timestamp(),
-    }
+# Reference time for expiry checks, with hour-wide margins either side.
+_NOW = time.time()
 
 
 class TestLoadTokens:
@@ -39,6 +39,17 @@ class TestLoadTokens:
         assert result["access_token"] == valid_tokens["access_token"]
         assert result["refresh_token"] == valid_tokens["refresh_token"]
 
+    def test_load_tokens_returns_read_only_snapshot(self, valid_tokens):
+        """Should not let callers mutate the stored tokens."""
+        caller_tokens = dict(valid_tokens)
+        save_tokens(caller_tokens)
+        caller_tokens["access_token"] = "changed_by_caller"
+        result = load_tokens()
+
+        assert result["access_token"] == "test_access_token_12345"
+        with pytest.raises(TypeError):
+            result["access_token"] = "changed"
+
 
 class TestSaveTokens:
     """Tests for save_tokens function."""
@@ -79,15 +90,77 @@ class TestIsTokenExpired:
 
     def test_expired_token_returns_true(self):
         """Should return True for expired tokens."""
-        tokens = {"expires_at": (datetime.now() - timedelta(hours=1)).timestamp()}
+        tokens = {"expires_at": _NOW - 3600}
         assert is_token_expired(tokens) is True
 
     def test_valid_token_returns_false(self):
         """Should return False for valid tokens."""
-        tokens = {"expires_at": (datetime.now() + timedelta(hours=1)).timestamp()}
+        tokens = {"expires_at": _NOW + 3600}
         assert is_token_expired(tokens) is False
 
     def test_zero_expires_at_returns_true(self):
         """Should return True when expires_at is 0."""
         tokens = {"expires_at": 0}
         assert is_token_expired(tokens) is True
+
+
+class TestTokenListeners:
+    """Tests for token-change callbacks."""
+
+    def test_listeners_run_on_save_and_delete(self, valid_tokens):
+        """Should notify listeners whenever tokens are saved or deleted."""
+        calls = []
+        with patch("strava_mcp.tokens._listeners", []):
+            on_tokens_changed(lambda: calls.append(load_tokens()))
+            save_tokens(valid_tokens)
+            delete_tokens()
+
+        assert calls == [valid_tokens, None]
+
+
+class TestCredentialsCache:
+    """Tests for cached credential lookups."""
+
+    def test_client_id_is_cached_until_cleared(self):
+        """Should keep returning the cached value until the cache is cleared."""
+        with patch.dict("os.environ", {"STRAVA_CLIENT_ID": "111"}):
+            assert get_client_id() == 111
+
+        with patch.dict("os.environ", {"STRAVA_CLIENT_ID": "222"}):
+            assert get_client_id() == 111
+            clear_credentials_cache()
+            assert get_client_id() == 222
+
+    def test_load_env_invalidates_cached_credentials(self, monkeypatch):
+        """Should re-read credentials after a .env reload."""
+        monkeypatch.delenv("STRAVA_CLIENT_ID", raising=False)
+        monkeypatch.delenv("STRAVA_CLIENT_SECRET", raising=False)
+        assert has_credentials() is False
+
+        def fake_load_dotenv(override):
+            monkeypatch.setenv("STRAVA_CLIENT_ID", "333")
+            monkeypatch.setenv("STRAVA_CLIENT_SECRET", "secret")
+
+        with patch("strava_mcp.tokens.load_dotenv", side_effect=fake_load_dotenv):
+            load_env()
+
+        assert has_credentials() is True
+        assert get_client_id() == 333
+
+
+class TestHttpSession:
+    """Tests for the shared HTTP session."""
+
+    def test_session_is_shared(self):
+        """Should hand every caller the same pooled session."""
+        assert get_http_session() is get_http_session()
+
+    def test_retries_server_errors_but_not_posts(self):
+        """Should retry 5xx responses for idempotent methods only."""
+        retry = get_http_session().get_adapter("https://www.strava.com").max_retries
+
+        assert retry.total == 3
+        assert 503 in retry.status_forcelist
+        assert 429 not in retry.status_forcelist
+        assert "GET" in retry.allowed_methods
+        assert "POST" not in retry.allowed_methods
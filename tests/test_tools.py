@@ -1,30 +1,182 @@
 """Tests for MCP server tools."""
 
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
 
 import pytest
+import requests
+from stravalib.client import BatchedResultsIterator
+from stravalib.model import DetailedActivity, Route
+
+from strava_mcp import server
+from strava_mcp.oauth import validate_oauth_state
+from strava_mcp.server import (
+    _parse_date,
+    _rate_limits,
+    _sized_pages,
+    authenticate,
+    explore_running_segments,
+    geocode_location,
+    geocode_locations,
+    get_activities,
+    get_activities_details,
+    get_activity_details,
+    get_athlete,
+    get_athlete_stats,
+    get_auth_status,
+    get_auth_url,
+    get_my_koms,
+    get_my_routes,
+    get_route,
+    get_segment,
+    get_segments_bulk,
+    handle_strava_errors,
+    logout,
+    update_activity_notes,
+)
+from strava_mcp.tokens import (
+    clear_credentials_cache,
+    get_http_session,
+    load_tokens,
+    save_tokens,
+)
+
+
+class TestHandleStravaErrors:
+    """Tests for the handle_strava_errors decorator."""
+
+    @staticmethod
+    def _http_error(status_code):
+        response = requests.Response()
+        response.status_code = status_code
+        return requests.exceptions.HTTPError("boom", response=response)
+
+    @pytest.mark.parametrize(
+        "exc,expected",
+        [
+            (ValueError("bad input"), "validation_error"),
+            (requests.exceptions.ConnectionError(), "network_error"),
+            (requests.exceptions.ConnectTimeout(), "network_error"),
+            (requests.exceptions.Timeout(), "timeout"),
+            (RuntimeError("surprise"), "unexpected_error"),
+        ],
+    )
+    async def test_maps_exceptions_to_error_codes(self, exc, expected):
+        """Should map each exception family to its structured error."""
+
+        @handle_strava_errors
+        async def failing():
+            raise exc
+
+        result = await failing()
+
+        assert result["error"] == expected
+
+    @pytest.mark.parametrize(
+        "status_code,expected",
+        [
+            (429, "rate_limited"),
+            (401, "unauthorized"),
+            (404, "not_found"),
+            (403, "forbidden"),
+        ],
+    )
+    async def test_maps_known_http_status_codes(self, status_code, expected):
+        """Should return the dedicated response for well-known status codes."""
+
+        @handle_strava_errors
+        async def failing():
+            raise self._http_error(status_code)
+
+        result = await failing()
+
+        assert result["error"] == expected
+
+    async def test_other_http_errors_report_status_code(self):
+        """Should include the status code for unmapped HTTP errors."""
+
+        @handle_strava_errors
+        async def failing():
+            raise self._http_error(500)
+
+        result = await failing()
+
+        assert result["error"] == "api_error"
+        assert result["status_code"] == 500
+
+    async def test_unauthorized_drops_cached_data_and_client(self):
+        """Should stop serving cached data once Strava rejects the token."""
+        server._activity_cache.set((1,), {"id": 1})
+        server._client = MagicMock()
+
+        @server.handle_strava_errors
+        async def failing():
+            raise self._http_error(401)
+
+        await failing()
+
+        assert server._activity_cache.get((1,)) is None
+        assert server._client is None
+
+
+class TestResponseCaches:
+    """Tests for the per-login response caches."""
+
+    async def test_fetch_finishing_after_logout_is_not_cached(self, valid_tokens):
+        """Should not cache a response fetched under the previous tokens."""
+        save_tokens(valid_tokens)
+
+        def fetch(item_id):
+            server._clear_response_caches()
+            return {"id": item_id}
+
+        result = await server._fetch_cached(server._activity_cache, fetch, 1)
+
+        assert result == {"id": 1}
+        assert server._activity_cache.get((1,)) is None
+
+    def test_athlete_id_fetched_before_logout_is_not_kept(self, mock_athlete):
+        """Should not remember an athlete id looked up under the previous tokens."""
+        client = MagicMock()
+
+        def get_athlete():
+            server._clear_response_caches()
+            return mock_athlete
+
+        client.get_athlete.side_effect = get_athlete
+
+        assert server._authenticated_athlete_id(client) == mock_athlete.id
+        assert server._athlete_id is None
+
+    async def test_returns_independent_copies_of_fixed_errors(self):
+        """Should not hand out the shared templates for callers to mutate."""
 
-from strava_mcp.tokens import load_tokens, save_tokens
+        @handle_strava_errors
+        async def failing():
+            raise requests.exceptions.Timeout()
+
+        first = await failing()
+        first["extra"] = True
+
+        assert "extra" not in await failing()
 
 
 class TestGetAuthStatus:
     """Tests for get_auth_status tool."""
 
-    @pytest.mark.asyncio
     async def test_returns_not_authenticated_when_no_tokens(self):
         """Should return not authenticated when no tokens exist."""
-        from strava_mcp.server import get_auth_status
-
         result = await get_auth_status()
 
         assert result["authenticated"] is False
         assert "No tokens found" in result["message"]
 
-    @pytest.mark.asyncio
     async def test_returns_authenticated_with_valid_tokens(self, valid_tokens):
         """Should return authenticated when valid tokens exist."""
-        from strava_mcp.server import get_auth_status
-
         save_tokens(valid_tokens)
 
         result = await get_auth_status()
@@ -33,11 +185,8 @@ class TestGetAuthStatus:
         assert result["is_expired"] is False
         assert "ready" in result["message"].lower()
 
-    @pytest.mark.asyncio
     async def test_returns_expired_status_for_expired_tokens(self, expired_tokens):
         """Should indicate expired status when tokens are expired."""
-        from strava_mcp.server import get_auth_status
-
         save_tokens(expired_tokens)
 
         result = await get_auth_status()
@@ -50,94 +199,116 @@ class TestGetAuthStatus:
 class TestGetAuthUrl:
     """Tests for get_auth_url tool."""
 
-    @pytest.mark.asyncio
-    async def test_returns_authorization_url(self, mock_strava_client, mock_env_vars):
-        """Should return a Strava authorization URL."""
-        from strava_mcp.server import get_auth_url
-
-        # Patch the oauth server start to avoid actually starting it
-        with patch("strava_mcp.server.start_oauth_server", return_value=True):
-            result = await get_auth_url()
+    async def test_auth_url_response(
+        self, mock_strava_client, mock_env_vars, stub_oauth_server
+    ):
+        """Should return a Strava authorization URL and the OAuth server info."""
+        result = await get_auth_url()
 
         assert "auth_url" in result
         assert "strava.com" in result["auth_url"]
         assert "instructions" in result
-
-    @pytest.mark.asyncio
-    async def test_includes_oauth_server_info(self, mock_strava_client, mock_env_vars):
-        """Should include OAuth server information."""
-        from strava_mcp.server import get_auth_url
-
-        with patch("strava_mcp.server.start_oauth_server", return_value=True):
-            result = await get_auth_url()
-
         assert "oauth_server" in result
         assert "127.0.0.1" in result["oauth_server"]
 
-    @pytest.mark.asyncio
     async def test_includes_state_parameter_for_csrf_protection(
-        self, mock_strava_client, mock_env_vars
+        self, mock_strava_client, mock_env_vars, stub_oauth_server
     ):
         """Should include state parameter in authorization URL for CSRF protection."""
-        from strava_mcp.server import get_auth_url
+        result = await get_auth_url()
+
+        # Verify the URL carries a state that the callback will accept
+        query = parse_qs(urlparse(result["auth_url"]).query)
+        assert len(query["state"]) == 1
+        assert validate_oauth_state(query["state"][0]) is True
 
-        with patch("strava_mcp.server.start_oauth_server", return_value=True):
-            await get_auth_url()
+    async def test_uses_fresh_state_for_each_url(
+        self, mock_strava_client, mock_env_vars, stub_oauth_server
+    ):
+        """Should reuse the cached base URL but never reuse a state."""
+        first = await get_auth_url()
+        second = await get_auth_url()
 
-        # Verify authorization_url was called with state parameter
+        first_state = parse_qs(urlparse(first["auth_url"]).query)["state"]
+        second_state = parse_qs(urlparse(second["auth_url"]).query)["state"]
+        assert first_state != second_state
         mock_strava_client.return_value.authorization_url.assert_called_once()
-        call_kwargs = mock_strava_client.return_value.authorization_url.call_args
-        assert "state" in call_kwargs.kwargs
-        assert call_kwargs.kwargs["state"] is not None
-        assert len(call_kwargs.kwargs["state"]) > 0
+
+    async def test_uses_reloaded_client_id(
+        self, mock_strava_client, mock_env_vars, stub_oauth_server, monkeypatch
+    ):
+        """Should build a new URL once the client id in the environment changes."""
+        await get_auth_url()
+        monkeypatch.setenv("STRAVA_CLIENT_ID", "67890")
+        clear_credentials_cache()
+        await get_auth_url()
+
+        call = mock_strava_client.return_value.authorization_url.call_args
+        assert call.kwargs["client_id"] == 67890
+
+    async def test_requests_write_scope(
+        self, mock_strava_client, mock_env_vars, stub_oauth_server
+    ):
+        """Should request activity:write so notes can be updated."""
+        await get_auth_url()
+
+        call = mock_strava_client.return_value.authorization_url.call_args
+        assert "activity:write" in call.kwargs["scope"]
 
 
 class TestAuthenticate:
     """Tests for authenticate tool."""
 
-    @pytest.mark.asyncio
     async def test_exchanges_code_and_saves_tokens(
         self, mock_strava_client, mock_env_vars, mock_athlete
     ):
-        """Should exchange code for tokens and save them."""
-        from strava_mcp.server import authenticate
-
-        # Configure mock to return athlete on get_athlete call
-        mock_strava_client.return_value.get_athlete.return_value = mock_athlete
-
+        """Should exchange code for tokens, save them and report the athlete."""
         result = await authenticate(code="test_auth_code")
 
         assert result["success"] is True
         assert "Test User" in result["message"]
         assert result["athlete_id"] == mock_athlete.id
+        assert "expires_at" in result
 
         # Verify tokens were saved
         stored = load_tokens()
         assert stored is not None
 
-    @pytest.mark.asyncio
-    async def test_returns_athlete_info(
-        self, mock_strava_client, mock_env_vars, mock_athlete
+    async def test_reuses_one_client_for_exchange_and_athlete(
+        self, mock_strava_client, mock_env_vars
     ):
-        """Should return athlete information after authentication."""
-        from strava_mcp.server import authenticate
+        """Should fetch the athlete on the client that exchanged the code."""
+        await server.authenticate(code="test_auth_code")
 
-        mock_strava_client.return_value.get_athlete.return_value = mock_athlete
+        mock_strava_client.assert_called_once_with(
+            requests_session=get_http_session(), rate_limiter=server._rate_limits
+        )
+        mock_strava_client.return_value.get_athlete.assert_called_once()
 
-        result = await authenticate(code="test_auth_code")
+    async def test_later_tool_calls_reuse_login_client(
+        self, mock_strava_client, mock_env_vars
+    ):
+        """Should serve tool calls after login with the client that logged in."""
+        await authenticate(code="test_auth_code")
+        await get_activity_details(activity_id=123456)
 
-        assert result["athlete_id"] == 12345678
-        assert "expires_at" in result
+        assert mock_strava_client.call_count == 1
+        mock_strava_client.return_value.get_activity.assert_called_once_with(123456)
+
+    async def test_remembers_athlete_id(
+        self, mock_strava_client, mock_env_vars, mock_athlete
+    ):
+        """Should keep the logged-in athlete's id for later lookups."""
+        await authenticate(code="test_auth_code")
+
+        assert server._athlete_id == mock_athlete.id
 
 
 class TestLogout:
     """Tests for logout tool."""
 
-    @pytest.mark.asyncio
     async def test_deletes_tokens(self, valid_tokens):
         """Should delete tokens from memory."""
-        from strava_mcp.server import logout
-
         # Store tokens first
         save_tokens(valid_tokens)
 
@@ -146,30 +317,43 @@ class TestLogout:
         assert result["success"] is True
         assert load_tokens() is None
 
-    @pytest.mark.asyncio
     async def test_succeeds_when_no_tokens(self):
         """Should succeed even when no tokens exist."""
-        from strava_mcp.server import logout
-
         result = await logout()
 
         assert result["success"] is True
 
 
+class TestRequiresAuthentication:
+    """Tests for tools called before logging in."""
+
+    @pytest.mark.parametrize(
+        "tool,kwargs",
+        [
+            pytest.param(get_activities, {}, id="activities"),
+            pytest.param(get_athlete, {}, id="athlete"),
+            pytest.param(get_athlete_stats, {}, id="stats"),
+            pytest.param(get_activity_details, {"activity_id": 1}, id="details"),
+        ],
+    )
+    async def test_returns_error_when_not_authenticated(self, tool, kwargs):
+        """Should return an error dict instead of calling Strava."""
+        result = await tool(**kwargs)
+
+        assert result["error"] == "validation_error"
+        assert "Not authenticated" in result["message"]
+
+
 class TestGetActivities:
     """Tests for get_activities tool."""
 
-    @pytest.mark.asyncio
     async def test_returns_activities(
         self,
         mock_strava_client,
-        mock_env_vars,
         valid_tokens,
         mock_activity,
     ):
         """Should return list of activities."""
-        from strava_mcp.server import get_activities
-
         save_tokens(valid_tokens)
 
         result = await get_activities(limit=5)
@@ -178,47 +362,53 @@ class TestGetActivities:
         assert len(result) >= 1
         assert result[0]["name"] == "Morning Run"
 
-    @pytest.mark.asyncio
-    async def test_parses_date_filters(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
+    async def test_parses_date_filters(self, mock_strava_client, valid_tokens):
         """Should parse and apply date filters."""
-        from strava_mcp.server import get_activities
-
         save_tokens(valid_tokens)
 
         await get_activities(after="2025-12-01", before="2025-12-31", limit=10)
 
-        # Verify the client was called with datetime objects
-        call_args = mock_strava_client.return_value.get_activities.call_args
-        assert call_args is not None
+        # Verify the dates were sent as UTC epoch seconds
+        mock_strava_client.return_value.protocol.get.assert_called_once_with(
+            "/athlete/activities",
+            after=1764547200,
+            before=1767139200,
+            per_page=10,
+            page=1,
+        )
 
-    @pytest.mark.asyncio
-    async def test_returns_error_when_not_authenticated(self):
-        """Should return error dict when not authenticated."""
-        from strava_mcp.server import get_activities
+    @pytest.mark.parametrize(
+        "bad_date", ["yesterday", "2025-13-01", "2025-1-1x", "2025-12-01\n"]
+    )
+    async def test_rejects_invalid_dates(
+        self, mock_strava_client, valid_tokens, bad_date
+    ):
+        """Should return a validation error for malformed or impossible dates."""
+        save_tokens(valid_tokens)
+
+        result = await get_activities(after=bad_date)
 
-        result = await get_activities()
-        assert isinstance(result, dict)
-        assert "error" in result
         assert result["error"] == "validation_error"
-        assert "Not authenticated" in result["message"]
+        assert bad_date in result["message"]
+        mock_strava_client.return_value.protocol.get.assert_not_called()
+
+    def test_memoizes_parsed_dates(self):
+        """Should reuse parsed dates and keep rejecting repeated bad ones."""
+        assert _parse_date("2025-12-01") is _parse_date("2025-12-01")
+        assert _parse_date("yesterday") is None
+        assert _parse_date("yesterday") is None
 
 
 class TestGetAthlete:
     """Tests for get_athlete tool."""
 
-    @pytest.mark.asyncio
     async def test_returns_athlete_profile(
         self,
         mock_strava_client,
-        mock_env_vars,
         valid_tokens,
         mock_athlete,
     ):
         """Should return athlete profile."""
-        from strava_mcp.server import get_athlete
-
         save_tokens(valid_tokens)
 
         result = await get_athlete()
@@ -231,56 +421,44 @@ class TestGetAthlete:
 class TestGetAthleteStats:
     """Tests for get_athlete_stats tool."""
 
-    @pytest.mark.asyncio
-    async def test_returns_stats(
-        self,
-        mock_strava_client,
-        mock_env_vars,
-        valid_tokens,
-        mock_athlete_stats,
-    ):
-        """Should return athlete statistics."""
-        from strava_mcp.server import get_athlete_stats
-
+    @pytest.mark.parametrize(
+        "athlete_id",
+        [pytest.param(None, id="authenticated"), pytest.param(12345678, id="by-id")],
+    )
+    async def test_returns_stats(self, mock_strava_client, valid_tokens, athlete_id):
+        """Should return statistics for the requested athlete."""
         save_tokens(valid_tokens)
 
-        result = await get_athlete_stats()
+        result = await get_athlete_stats(athlete_id=athlete_id)
 
         assert "recent_run_totals" in result
         assert "ytd_run_totals" in result
         assert "all_run_totals" in result
+        mock_strava_client.return_value.get_athlete_stats.assert_called_with(
+            athlete_id=athlete_id
+        )
 
-    @pytest.mark.asyncio
-    async def test_accepts_athlete_id(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
-        """Should accept an athlete_id parameter."""
-        from strava_mcp.server import get_athlete_stats
-
+    async def test_caches_stats_per_athlete(self, mock_strava_client, valid_tokens):
+        """Should fetch each athlete's stats once within the cache window."""
         save_tokens(valid_tokens)
 
+        await get_athlete_stats()
+        await get_athlete_stats()
         await get_athlete_stats(athlete_id=12345678)
 
-        # Verify client was called with athlete_id
-        mock_strava_client.return_value.get_athlete_stats.assert_called_with(
-            athlete_id=12345678
-        )
+        assert mock_strava_client.return_value.get_athlete_stats.call_count == 2
 
 
 class TestGetActivityDetails:
     """Tests for get_activity_details tool."""
 
-    @pytest.mark.asyncio
     async def test_returns_activity_details(
         self,
         mock_strava_client,
-        mock_env_vars,
         valid_tokens,
         mock_activity,
     ):
         """Should return detailed activity information."""
-        from strava_mcp.server import get_activity_details
-
         save_tokens(valid_tokens)
 
         result = await get_activity_details(activity_id=9876543210)
@@ -289,33 +467,90 @@ class TestGetActivityDetails:
         assert result["name"] == "Morning Run"
         assert result["type"] == "Run"
 
-    @pytest.mark.asyncio
-    async def test_calls_client_with_activity_id(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
-        """Should call client.get_activity with correct activity_id."""
-        from strava_mcp.server import get_activity_details
+    async def test_omits_empty_fields(self, mock_strava_client, valid_tokens):
+        """Should leave out fields Strava didn't populate."""
+        save_tokens(valid_tokens)
+        mock_strava_client.return_value.get_activity.return_value = DetailedActivity(
+            id=123456, name="Lunch Ride"
+        )
+
+        result = await get_activity_details(activity_id=123456)
+
+        assert result == {"id": 123456, "name": "Lunch Ride"}
 
+    async def test_caches_details_until_notes_are_updated(
+        self, mock_strava_client, valid_tokens
+    ):
+        """Should reuse cached details, refetching after the notes change."""
         save_tokens(valid_tokens)
+        client_instance = mock_strava_client.return_value
+
+        await get_activity_details(activity_id=123456)
+        await get_activity_details(activity_id=123456)
+        assert client_instance.get_activity.call_count == 1
 
+        await update_activity_notes(activity_id=123456, notes="New notes")
         await get_activity_details(activity_id=123456)
+        assert client_instance.get_activity.call_count == 2
+
+
+class TestGetActivitiesDetails:
+    """Tests for get_activities_details tool."""
+
+    async def test_returns_activities_in_request_order(
+        self, mock_strava_client, valid_tokens
+    ):
+        """Should fetch each unique activity and keep the requested order."""
+        save_tokens(valid_tokens)
+
+        def get_activity(activity_id):
+            return SimpleNamespace(model_dump=lambda **kwargs: {"id": activity_id})
+
+        client_instance = mock_strava_client.return_value
+        client_instance.get_activity.side_effect = get_activity
 
-        mock_strava_client.return_value.get_activity.assert_called_with(123456)
+        result = await get_activities_details(activity_ids=[3, 1, 2, 3])
+
+        assert result["count"] == 3
+        assert [a["id"] for a in result["activities"]] == [3, 1, 2]
+        assert client_instance.get_activity.call_count == 3
+
+    async def test_reports_failed_activities_individually(
+        self, mock_strava_client, valid_tokens, mock_activity
+    ):
+        """Should return an error entry for a failed id alongside the others."""
+        save_tokens(valid_tokens)
+
+        def get_activity(activity_id):
+            if activity_id == 404:
+                raise requests.HTTPError(response=SimpleNamespace(status_code=404))
+            return mock_activity
+
+        client_instance = mock_strava_client.return_value
+        client_instance.get_activity.side_effect = get_activity
+
+        result = await get_activities_details(activity_ids=[9876543210, 404])
+
+        assert result["activities"][0]["name"] == "Morning Run"
+        assert result["activities"][1]["id"] == 404
+        assert result["activities"][1]["error"] == "not_found"
+
+    async def test_validates_activity_ids(self):
+        """Should reject an empty id list."""
+        result = await get_activities_details(activity_ids=[])
+
+        assert result["error"] == "validation_error"
 
 
 class TestUpdateActivityNotes:
     """Tests for update_activity_notes tool."""
 
-    @pytest.mark.asyncio
     async def test_updates_activity_notes(
         self,
         mock_strava_client,
-        mock_env_vars,
         valid_tokens,
     ):
         """Should update activity notes and return success."""
-        from strava_mcp.server import update_activity_notes
-
         save_tokens(valid_tokens)
 
         result = await update_activity_notes(
@@ -327,13 +562,10 @@ class TestUpdateActivityNotes:
         assert result["activity"]["id"] == 9876543210
         assert result["activity"]["description"] == "Updated notes"
 
-    @pytest.mark.asyncio
     async def test_calls_client_with_correct_params(
-        self, mock_strava_client, mock_env_vars, valid_tokens
+        self, mock_strava_client, valid_tokens
     ):
         """Should call client.update_activity with correct parameters."""
-        from strava_mcp.server import update_activity_notes
-
         save_tokens(valid_tokens)
 
         await update_activity_notes(activity_id=123456, notes="New notes")
@@ -342,46 +574,32 @@ class TestUpdateActivityNotes:
             123456, description="New notes"
         )
 
-    @pytest.mark.asyncio
     async def test_returns_error_for_invalid_activity_id(self):
         """Should return error for invalid activity_id."""
-        from strava_mcp.server import update_activity_notes
-
         result = await update_activity_notes(activity_id=0, notes="Some notes")
 
         assert "error" in result
         assert result["error"] == "validation_error"
         assert "positive integer" in result["message"]
 
-    @pytest.mark.asyncio
     async def test_returns_error_for_empty_notes(self):
         """Should return error for empty notes."""
-        from strava_mcp.server import update_activity_notes
-
         result = await update_activity_notes(activity_id=123456, notes="")
 
         assert "error" in result
         assert result["error"] == "validation_error"
         assert "cannot be empty" in result["message"]
 
-    @pytest.mark.asyncio
     async def test_returns_error_for_whitespace_only_notes(self):
         """Should return error for whitespace-only notes."""
-        from strava_mcp.server import update_activity_notes
-
         result = await update_activity_notes(activity_id=123456, notes="   ")
 
         assert "error" in result
         assert result["error"] == "validation_error"
         assert "cannot be empty" in result["message"]
 
-    @pytest.mark.asyncio
-    async def test_strips_whitespace_from_notes(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
+    async def test_strips_whitespace_from_notes(self, mock_strava_client, valid_tokens):
         """Should strip leading/trailing whitespace from notes."""
-        from strava_mcp.server import update_activity_notes
-
         save_tokens(valid_tokens)
 
         await update_activity_notes(activity_id=123456, notes="  Trimmed notes  ")
@@ -391,16 +609,39 @@ class TestUpdateActivityNotes:
         )
 
 
+class TestAuthenticatedClient:
+    """Tests for reuse of the authenticated client."""
+
+    async def test_reuses_client_across_calls(self, mock_strava_client, valid_tokens):
+        """Should build one client for several tool calls."""
+        save_tokens(valid_tokens)
+
+        await get_athlete()
+        await get_athlete()
+
+        assert mock_strava_client.call_count == 1
+
+    async def test_rebuilds_client_when_tokens_change(
+        self, mock_strava_client, valid_tokens
+    ):
+        """Should build a new client with the new access token after login."""
+        save_tokens(valid_tokens)
+        await get_athlete()
+
+        save_tokens({**valid_tokens, "access_token": "second_token"})
+        await get_athlete()
+
+        assert mock_strava_client.call_count == 2
+        assert mock_strava_client.call_args.kwargs["access_token"] == "second_token"
+
+
 class TestTokenRefresh:
     """Tests for automatic token refresh."""
 
-    @pytest.mark.asyncio
     async def test_refreshes_expired_tokens(
         self, mock_strava_client, mock_env_vars, expired_tokens
     ):
         """Should refresh tokens when they're expired."""
-        from strava_mcp.server import get_athlete
-
         save_tokens(expired_tokens)
 
         await get_athlete()
@@ -412,23 +653,125 @@ class TestTokenRefresh:
         stored = load_tokens()
         assert stored["access_token"] == "refreshed_token"
 
+    async def test_concurrent_calls_refresh_once(
+        self, mock_strava_client, mock_env_vars, expired_tokens
+    ):
+        """Should refresh only once when several tool calls see an expired token."""
+        save_tokens(expired_tokens)
+        client_instance = mock_strava_client.return_value
+        refreshed = client_instance.refresh_access_token.return_value
+
+        def slow_refresh(**kwargs):
+            time.sleep(0.05)
+            return refreshed
+
+        client_instance.refresh_access_token.side_effect = slow_refresh
+
+        await asyncio.gather(*(get_athlete() for _ in range(4)))
+
+        client_instance.refresh_access_token.assert_called_once()
+        assert client_instance.get_athlete.call_count == 4
+
+    async def test_refreshes_tokens_about_to_expire(
+        self, mock_strava_client, mock_env_vars, valid_tokens
+    ):
+        """Should refresh tokens that expire within the refresh margin."""
+        save_tokens({**valid_tokens, "expires_at": time.time() + 60})
+
+        await get_athlete()
+
+        mock_strava_client.return_value.refresh_access_token.assert_called_once()
+
+    async def test_skips_token_lookup_once_known_fresh(
+        self, mock_strava_client, valid_tokens
+    ):
+        """Should not reload tokens on every call while they are fresh."""
+        save_tokens(valid_tokens)
+        await server._ensure_fresh_tokens()
+
+        with patch("strava_mcp.server.load_tokens") as mock_load:
+            await server._ensure_fresh_tokens()
+
+        mock_load.assert_not_called()
+
+
+class TestStravaConcurrency:
+    """Tests for the cap on concurrent Strava requests."""
+
+    async def test_limits_requests_in_flight(self, valid_tokens):
+        """Should never run more helpers at once than the semaphore allows."""
+        save_tokens(valid_tokens)
+        server._strava_semaphore = asyncio.Semaphore(2)
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def slow_fetch():
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+
+        await asyncio.gather(*(server._run_strava(slow_fetch) for _ in range(6)))
+
+        assert peak == 2
+
+
+class TestRateLimits:
+    """Tests for the Strava rate-limit tracker."""
+
+    @staticmethod
+    def _headers(usage, limit="100,1000"):
+        return {"X-RateLimit-Usage": usage, "X-RateLimit-Limit": limit}
+
+    def test_tracks_exhausted_window_until_it_resets(self):
+        """Should block while a window is used up and lift it once it resets."""
+        _rate_limits(self._headers("5,300"), "GET")
+        assert _rate_limits.retry_after() == 0
+
+        _rate_limits(self._headers("100,300"), "GET")
+        assert 0 < _rate_limits.retry_after() <= 900
+
+        with patch("strava_mcp.server.time.time", return_value=time.time() + 901):
+            assert _rate_limits.retry_after() == 0
+
+    def test_under_quota_response_keeps_block(self):
+        """Should not lift a block because another response is under quota."""
+        _rate_limits(self._headers("100,300"), "GET")
+        _rate_limits(self._headers("5,300"), "GET")
+
+        assert _rate_limits.retry_after() > 0
+
+    def test_shorter_block_does_not_shrink_daily_block(self):
+        """Should keep a daily block when a later response hits the short limit."""
+        _rate_limits(self._headers("50,1000"), "GET")
+        daily = _rate_limits.retry_after()
+        _rate_limits(self._headers("100,300"), "GET")
+
+        assert _rate_limits.retry_after() >= daily - 1
+
+    async def test_refuses_requests_while_limited(
+        self, mock_strava_client, valid_tokens
+    ):
+        """Should return rate_limited without calling Strava."""
+        save_tokens(valid_tokens)
+        _rate_limits(self._headers("50,1000"), "GET")
+
+        result = await get_activity_details(activity_id=123456)
+
+        assert result["error"] == "rate_limited"
+        assert result["retry_after_seconds"] > 0
+        mock_strava_client.return_value.get_activity.assert_not_called()
+
 
 class TestGeocodeLocation:
     """Tests for geocode_location tool."""
 
-    @pytest.mark.asyncio
-    async def test_returns_location_and_bounds(self):
+    async def test_returns_location_and_bounds(self, mock_geocoder):
         """Should return location details and bounding box."""
-        from strava_mcp.server import geocode_location
-
-        with patch("strava_mcp.server._geocoder") as mock_geocoder:
-            mock_location = MagicMock()
-            mock_location.latitude = 37.7749
-            mock_location.longitude = -122.4194
-            mock_location.address = "San Francisco, CA, USA"
-            mock_geocoder.geocode.return_value = mock_location
-
-            result = await geocode_location("San Francisco", radius_km=5.0)
+        result = await geocode_location("San Francisco", radius_km=5.0)
 
         assert result["query"] == "San Francisco"
         assert result["location"]["latitude"] == 37.7749
@@ -437,47 +780,101 @@ class TestGeocodeLocation:
         assert "sw_lat" in result["bounds"]
         assert "ne_lat" in result["bounds"]
 
-    @pytest.mark.asyncio
     async def test_returns_error_for_empty_query(self):
         """Should return error for empty query."""
-        from strava_mcp.server import geocode_location
-
         result = await geocode_location("")
 
         assert "error" in result
         assert result["error"] == "validation_error"
 
-    @pytest.mark.asyncio
     async def test_returns_error_for_invalid_radius(self):
         """Should return error for invalid radius."""
-        from strava_mcp.server import geocode_location
-
         result = await geocode_location("San Francisco", radius_km=-5.0)
 
         assert "error" in result
         assert "radius_km must be positive" in result["message"]
 
-    @pytest.mark.asyncio
     async def test_returns_error_for_too_large_radius(self):
         """Should return error for radius > 50km."""
-        from strava_mcp.server import geocode_location
-
         result = await geocode_location("San Francisco", radius_km=100.0)
 
         assert "error" in result
         assert "50km" in result["message"]
 
+    async def test_spaces_nominatim_requests(self, mock_geocoder):
+        """Should wait out the throttle interval between consecutive lookups."""
+        server._nominatim_throttle = server._Throttle(min_interval=0.2)
+
+        start = time.monotonic()
+        await server.geocode_location("San Francisco")
+        await server.geocode_location("Oakland")
+        elapsed = time.monotonic() - start
+
+        assert mock_geocoder.geocode.call_count == 2
+        assert elapsed >= 0.2
+
+    async def test_caches_repeated_queries(self, mock_geocoder):
+        """Should geocode a place once and reuse it for later lookups."""
+        first = await geocode_location("San Francisco", radius_km=5.0)
+        with patch("strava_mcp.server.asyncio.to_thread") as mock_to_thread:
+            second = await geocode_location(" san francisco ", radius_km=10.0)
+
+        mock_to_thread.assert_not_called()
+        mock_geocoder.geocode.assert_called_once()
+        assert second["location"] == first["location"]
+        assert second["radius_km"] == 10.0
+        assert second["bounds"]["ne_lat"] > first["bounds"]["ne_lat"]
+
+
+class TestGeocodeLocations:
+    """Tests for geocode_locations tool."""
+
+    async def test_returns_results_keyed_by_query(self, mock_geocoder):
+        """Should geocode each unique query and report misses individually."""
+        server._nominatim_throttle = server._Throttle(min_interval=0.0)
+
+        def geocode(query, exactly_one):
+            if query == "Atlantis":
+                return None
+            return SimpleNamespace(
+                latitude=37.7749, longitude=-122.4194, address=f"{query}, USA"
+            )
+
+        mock_geocoder.geocode.side_effect = geocode
+
+        result = await server.geocode_locations(
+            ["San Francisco", "Atlantis", " San Francisco "], radius_km=2.0
+        )
+
+        assert result["count"] == 2
+        locations = result["locations"]
+        assert locations["San Francisco"]["location"]["name"] == "San Francisco, USA"
+        assert locations["San Francisco"]["radius_km"] == 2.0
+        assert locations["Atlantis"]["error"] == "validation_error"
+        assert mock_geocoder.geocode.call_count == 2
+
+    @pytest.mark.parametrize(
+        "queries,radius_km,message",
+        [
+            ([], 5.0, "cannot be empty"),
+            (["", "  "], 5.0, "cannot be empty"),
+            ([f"Place {i}" for i in range(21)], 5.0, "at most 20"),
+            (["San Francisco"], 0.0, "radius_km must be positive"),
+        ],
+    )
+    async def test_validates_input(self, queries, radius_km, message):
+        """Should reject empty or oversized query lists and bad radii."""
+        result = await geocode_locations(queries, radius_km=radius_km)
+
+        assert result["error"] == "validation_error"
+        assert message in result["message"]
+
 
 class TestExploreRunningSegments:
     """Tests for explore_running_segments tool."""
 
-    @pytest.mark.asyncio
-    async def test_returns_segments_with_bounds(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
+    async def test_returns_segments_with_bounds(self, mock_strava_client, valid_tokens):
         """Should return segments when using bounds."""
-        from strava_mcp.server import explore_running_segments
-
         save_tokens(valid_tokens)
 
         result = await explore_running_segments(bounds=[37.7, -122.5, 37.8, -122.4])
@@ -486,46 +883,31 @@ class TestExploreRunningSegments:
         assert "segments" in result
         assert len(result["segments"]) >= 1
         assert result["segments"][0]["name"] == "Test Hill Climb"
+        assert result["segments"][0]["start_latlng"] == [37.7749, -122.4194]
         assert "links" in result["segments"][0]
         assert "web" in result["segments"][0]["links"]
 
-    @pytest.mark.asyncio
     async def test_returns_segments_with_location(
-        self, mock_strava_client, mock_env_vars, valid_tokens
+        self, mock_strava_client, valid_tokens, mock_geocoder
     ):
         """Should return segments when using location name."""
-        from strava_mcp.server import explore_running_segments
-
         save_tokens(valid_tokens)
 
-        with patch("strava_mcp.server._geocoder") as mock_geocoder:
-            mock_location = MagicMock()
-            mock_location.latitude = 37.7749
-            mock_location.longitude = -122.4194
-            mock_location.address = "San Francisco, CA, USA"
-            mock_geocoder.geocode.return_value = mock_location
-
-            result = await explore_running_segments(location="San Francisco")
+        result = await explore_running_segments(location="San Francisco")
 
         assert "count" in result
         assert "segments" in result
         assert "searched_location" in result
 
-    @pytest.mark.asyncio
     async def test_returns_error_when_neither_location_nor_bounds(self):
         """Should return error when neither location nor bounds provided."""
-        from strava_mcp.server import explore_running_segments
-
         result = await explore_running_segments()
 
         assert "error" in result
         assert "Provide either" in result["message"]
 
-    @pytest.mark.asyncio
     async def test_returns_error_when_both_location_and_bounds(self):
         """Should return error when both location and bounds provided."""
-        from strava_mcp.server import explore_running_segments
-
         result = await explore_running_segments(
             location="San Francisco", bounds=[37.7, -122.5, 37.8, -122.4]
         )
@@ -533,13 +915,8 @@ class TestExploreRunningSegments:
         assert "error" in result
         assert "not both" in result["message"]
 
-    @pytest.mark.asyncio
-    async def test_includes_deeplinks(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
+    async def test_includes_deeplinks(self, mock_strava_client, valid_tokens):
         """Should include web and app deeplinks."""
-        from strava_mcp.server import explore_running_segments
-
         save_tokens(valid_tokens)
 
         result = await explore_running_segments(bounds=[37.7, -122.5, 37.8, -122.4])
@@ -552,13 +929,8 @@ class TestExploreRunningSegments:
 class TestGetSegment:
     """Tests for get_segment tool."""
 
-    @pytest.mark.asyncio
-    async def test_returns_segment_details(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
+    async def test_returns_segment_details(self, mock_strava_client, valid_tokens):
         """Should return full segment details."""
-        from strava_mcp.server import get_segment
-
         save_tokens(valid_tokens)
 
         result = await get_segment(segment_id=12345)
@@ -567,41 +939,93 @@ class TestGetSegment:
         assert result["name"] == "Test Hill Climb"
         assert "map_polyline" in result
         assert "links" in result
+        assert result["start_latlng"] == [37.7749, -122.4194]
 
-    @pytest.mark.asyncio
-    async def test_returns_error_for_invalid_id(self):
-        """Should return error for invalid segment_id."""
-        from strava_mcp.server import get_segment
+    async def test_caches_segment_until_tokens_change(
+        self, mock_strava_client, valid_tokens
+    ):
+        """Should serve repeat lookups from cache until tokens are replaced."""
+        save_tokens(valid_tokens)
+        client_instance = mock_strava_client.return_value
 
-        result = await get_segment(segment_id=0)
+        await get_segment(segment_id=12345)
+        await get_segment(segment_id=12345)
+        assert client_instance.get_segment.call_count == 1
 
-        assert "error" in result
-        assert "positive integer" in result["message"]
+        save_tokens(valid_tokens)
+        await get_segment(segment_id=12345)
+        assert client_instance.get_segment.call_count == 2
 
-    @pytest.mark.asyncio
-    async def test_calls_client_with_segment_id(
-        self, mock_strava_client, mock_env_vars, valid_tokens
+
+class TestGetSegmentsBulk:
+    """Tests for get_segments_bulk tool."""
+
+    async def test_returns_segments_in_request_order(
+        self, mock_strava_client, valid_tokens, mock_segment
     ):
-        """Should call client.get_segment with correct ID."""
-        from strava_mcp.server import get_segment
+        """Should fetch each unique segment and keep the requested order."""
+        save_tokens(valid_tokens)
+
+        def get_segment(segment_id):
+            return SimpleNamespace(**{**vars(mock_segment), "id": segment_id})
+
+        client_instance = mock_strava_client.return_value
+        client_instance.get_segment.side_effect = get_segment
 
+        result = await get_segments_bulk(segment_ids=[3, 1, 2, 1])
+
+        assert result["count"] == 3
+        assert [seg["id"] for seg in result["segments"]] == [3, 1, 2]
+        assert client_instance.get_segment.call_count == 3
+
+    async def test_reports_failed_segments_individually(
+        self, mock_strava_client, valid_tokens, mock_segment
+    ):
+        """Should return an error entry for a failed id alongside the others."""
         save_tokens(valid_tokens)
 
-        await get_segment(segment_id=99999)
+        def get_segment(segment_id):
+            if segment_id == 404:
+                raise requests.HTTPError(response=SimpleNamespace(status_code=404))
+            return mock_segment
+
+        client_instance = mock_strava_client.return_value
+        client_instance.get_segment.side_effect = get_segment
 
-        mock_strava_client.return_value.get_segment.assert_called_with(99999)
+        result = await get_segments_bulk(segment_ids=[12345, 404])
+
+        assert result["segments"][0]["name"] == "Test Hill Climb"
+        assert result["segments"][1]["id"] == 404
+        assert result["segments"][1]["error"] == "not_found"
+
+    @pytest.mark.parametrize(
+        "segment_ids,message",
+        [
+            ([], "cannot be empty"),
+            (list(range(1, 22)), "at most 20"),
+            ([1, 0], "positive integers"),
+        ],
+    )
+    async def test_validates_segment_ids(self, segment_ids, message):
+        """Should reject empty, oversized, or non-positive id lists."""
+        result = await get_segments_bulk(segment_ids=segment_ids)
+
+        assert result["error"] == "validation_error"
+        assert message in result["message"]
+
+    async def test_returns_error_when_not_authenticated(self):
+        """Should fail once up front instead of once per segment."""
+        result = await get_segments_bulk(segment_ids=[1, 2])
+
+        assert result["error"] == "validation_error"
+        assert "Not authenticated" in result["message"]
 
 
 class TestGetMyRoutes:
     """Tests for get_my_routes tool."""
 
-    @pytest.mark.asyncio
-    async def test_returns_routes(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
+    async def test_returns_routes(self, mock_strava_client, valid_tokens):
         """Should return list of routes."""
-        from strava_mcp.server import get_my_routes
-
         save_tokens(valid_tokens)
 
         result = await get_my_routes(limit=10)
@@ -612,23 +1036,34 @@ class TestGetMyRoutes:
         assert result["routes"][0]["name"] == "Morning Loop"
         assert "links" in result["routes"][0]
 
-    @pytest.mark.asyncio
     async def test_returns_error_for_invalid_limit(self):
         """Should return error for invalid limit."""
-        from strava_mcp.server import get_my_routes
-
         result = await get_my_routes(limit=0)
 
         assert "error" in result
         assert "at least 1" in result["message"]
 
-    @pytest.mark.asyncio
-    async def test_includes_deeplinks(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
-        """Should include web and app deeplinks."""
-        from strava_mcp.server import get_my_routes
+    async def test_caps_limit_at_strava_maximum(self, mock_strava_client, valid_tokens):
+        """Should clamp an oversized limit to 200."""
+        save_tokens(valid_tokens)
+
+        await get_my_routes(limit=500)
+
+        mock_strava_client.return_value.get_routes.assert_called_once_with(
+            athlete_id=None, limit=200
+        )
 
+    def test_requests_pages_sized_to_limit(self):
+        """Should ask Strava for only as many rows as the limit needs."""
+        fetcher = MagicMock(return_value=[])
+        results = BatchedResultsIterator(entity=Route, result_fetcher=fetcher, limit=5)
+
+        list(_sized_pages(results))
+
+        fetcher.assert_called_once_with(page=1, per_page=5)
+
+    async def test_includes_deeplinks(self, mock_strava_client, valid_tokens):
+        """Should include web and app deeplinks."""
         save_tokens(valid_tokens)
 
         result = await get_my_routes()
@@ -641,13 +1076,8 @@ class TestGetMyRoutes:
 class TestGetRoute:
     """Tests for get_route tool."""
 
-    @pytest.mark.asyncio
-    async def test_returns_route_details(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
+    async def test_returns_route_details(self, mock_strava_client, valid_tokens):
         """Should return full route details."""
-        from strava_mcp.server import get_route
-
         save_tokens(valid_tokens)
 
         result = await get_route(route_id=98765)
@@ -657,25 +1087,74 @@ class TestGetRoute:
         assert "map_polyline" in result
         assert "links" in result
 
-    @pytest.mark.asyncio
-    async def test_returns_error_for_invalid_id(self):
-        """Should return error for invalid route_id."""
-        from strava_mcp.server import get_route
 
-        result = await get_route(route_id=-1)
+class TestIdLookupTools:
+    """Behaviour shared by the tools that look up one object by ID."""
+
+    @pytest.mark.parametrize(
+        "tool,kwargs,client_method,expected_id",
+        [
+            pytest.param(
+                get_activity_details,
+                {"activity_id": 123456},
+                "get_activity",
+                123456,
+                id="activity",
+            ),
+            pytest.param(
+                get_segment, {"segment_id": 99999}, "get_segment", 99999, id="segment"
+            ),
+            pytest.param(
+                get_route, {"route_id": 11111}, "get_route", 11111, id="route"
+            ),
+        ],
+    )
+    async def test_calls_client_with_id(
+        self,
+        mock_strava_client,
+        valid_tokens,
+        tool,
+        kwargs,
+        client_method,
+        expected_id,
+    ):
+        """Should pass the requested ID straight to the Strava client."""
+        save_tokens(valid_tokens)
+
+        await tool(**kwargs)
+
+        getattr(mock_strava_client.return_value, client_method).assert_called_with(
+            expected_id
+        )
+
+    @pytest.mark.parametrize(
+        "tool,kwargs",
+        [
+            pytest.param(get_segment, {"segment_id": 0}, id="segment"),
+            pytest.param(get_route, {"route_id": -1}, id="route"),
+        ],
+    )
+    async def test_returns_error_for_invalid_id(self, tool, kwargs):
+        """Should reject IDs that are not positive integers."""
+        result = await tool(**kwargs)
 
         assert "error" in result
         assert "positive integer" in result["message"]
 
-    @pytest.mark.asyncio
-    async def test_calls_client_with_route_id(
-        self, mock_strava_client, mock_env_vars, valid_tokens
-    ):
-        """Should call client.get_route with correct ID."""
-        from strava_mcp.server import get_route
 
+class TestGetMyKoms:
+    """Tests for get_my_koms tool."""
+
+    async def test_looks_up_athlete_id_once(
+        self, mock_strava_client, valid_tokens, mock_athlete
+    ):
+        """Should reuse the authenticated athlete's id across calls."""
         save_tokens(valid_tokens)
+        client_instance = mock_strava_client.return_value
+        client_instance.get_athlete_koms.return_value = []
 
-        await get_route(route_id=11111)
+        await get_my_koms(limit=5)
+        await get_my_koms(limit=5)
 
-        mock_strava_client.return_value.get_route.assert_called_with(11111)
+        client_instance.get_athlete.assert_called_once()
+        client_instance.get_athlete_koms.assert_called_with(mock_athlete.id, limit=5)